@@ -0,0 +1,162 @@
+"""
+Admission control for the Professor Locator Flask apps
+Per-client token buckets plus a global concurrency cap with a short wait
+queue. Rejected requests get a fast 429 with Retry-After. Client tracking is
+an LRU bounded to a fixed number of clients.
+
+Clients are keyed by the connecting address. X-Forwarded-For is only read
+when TRUSTED_PROXY_HOPS says how many proxies in front of the app append to
+it; otherwise any client could pick its own key by sending the header.
+
+Environment variables:
+    RATE_LIMIT_RPS            sustained requests per second per client (default: 10)
+    RATE_LIMIT_BURST          bucket size, i.e. allowed burst per client (default: 30)
+    RATE_LIMIT_MAX_CLIENTS    clients tracked before the least recent is evicted (default: 10000)
+    MAX_CONCURRENT_REQUESTS   requests processed at once (default: 32)
+    MAX_QUEUED_REQUESTS       requests allowed to wait for a slot (default: 64)
+    QUEUE_TIMEOUT_MS          longest wait for a slot before rejecting (default: 100)
+    TRUSTED_PROXY_HOPS        proxies in front of the app whose X-Forwarded-For is trusted (default: 0)
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, jsonify, request
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+# Paths that are never limited, so monitoring keeps working under load
+EXEMPT_PATHS = ('/metrics', '/metrics.json')
+
+class TokenBucketLimiter:
+    """Per-client token buckets kept in a bounded LRU"""
+
+    def __init__(self, rate, burst, max_clients):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()  # client -> [tokens, last refill time]
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def acquire(self, client):
+        """Take one token; returns 0 if allowed, else seconds until a token is available"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = [self.burst, now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._buckets.move_to_end(client)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            return (1 - bucket[0]) / self.rate
+
+    def tracked_clients(self):
+        return len(self._buckets)
+
+class ConcurrencyLimiter:
+    """Global cap on in-flight requests with a short, bounded wait queue"""
+
+    def __init__(self, max_concurrent, max_queued, queue_timeout):
+        self.queue_timeout = queue_timeout
+        self.max_queued = max_queued
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._queued = 0
+
+    def acquire(self):
+        """Take a slot, waiting briefly if needed; returns False when overloaded"""
+        if self._slots.acquire(blocking=False):
+            return True
+        with self._lock:
+            if self._queued >= self.max_queued:
+                return False
+            self._queued += 1
+        try:
+            return self._slots.acquire(timeout=self.queue_timeout)
+        finally:
+            with self._lock:
+                self._queued -= 1
+
+    def release(self):
+        self._slots.release()
+
+def client_key():
+    """Identify the client by address; trusted proxy hops are already resolved by ProxyFix"""
+    return request.remote_addr or 'unknown'
+
+def install_admission_control(app, registry=None, environ=os.environ):
+    """Attach rate limiting and the concurrency cap to a Flask app"""
+    proxy_hops = int(environ.get('TRUSTED_PROXY_HOPS', '0'))
+    if proxy_hops > 0:
+        # remote_addr becomes the address the outermost trusted proxy saw
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops)
+
+    limiter = TokenBucketLimiter(
+        float(environ.get('RATE_LIMIT_RPS', '10')),
+        float(environ.get('RATE_LIMIT_BURST', '30')),
+        int(environ.get('RATE_LIMIT_MAX_CLIENTS', '10000'))
+    )
+    concurrency = ConcurrencyLimiter(
+        int(environ.get('MAX_CONCURRENT_REQUESTS', '32')),
+        int(environ.get('MAX_QUEUED_REQUESTS', '64')),
+        float(environ.get('QUEUE_TIMEOUT_MS', '100')) / 1000.0
+    )
+    counters = {'admitted': 0, 'rate_limited': 0, 'overloaded': 0}
+    counters_lock = threading.Lock()
+
+    def count(outcome):
+        with counters_lock:
+            counters[outcome] += 1
+        if registry is not None:
+            registry.inc('admission_decisions_total', (('outcome', outcome),))
+
+    def reject(reason, retry_after):
+        response = jsonify({'error': reason})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        return response
+
+    @app.before_request
+    def admit_request():
+        if request.path in EXEMPT_PATHS:
+            return None
+
+        wait = limiter.acquire(client_key())
+        if wait:
+            count('rate_limited')
+            return reject('Rate limit exceeded', wait)
+
+        if not concurrency.acquire():
+            count('overloaded')
+            return reject('Server busy', 1)
+
+        g.admission_slot = True
+        count('admitted')
+        return None
+
+    @app.teardown_request
+    def release_slot(exc):
+        if g.pop('admission_slot', False):
+            concurrency.release()
+
+    @app.route('/api/admission_stats')
+    def admission_stats():
+        """Admission control counters"""
+        with counters_lock:
+            stats = dict(counters)
+        stats['tracked_clients'] = limiter.tracked_clients()
+        stats['evicted_clients'] = limiter.evictions
+        return jsonify(stats)
+
+    return limiter, concurrency
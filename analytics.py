@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Room and faculty utilization analytics
+Builds NumPy occupancy tensors (room x day x slot and instructor x day x slot)
+from the schedule data once, then answers every report with vectorized
+reductions over those tensors.
+
+Usage:
+    python analytics.py [room_occupancy|teaching_load|peak_hours] [--data structured_data.json]
+"""
+
+import argparse
+import json
+import threading
+
+import numpy as np
+
+from timeslots import parse_time_range
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+# Teaching slots are the hours starting 8:00 to 19:00 (hours 1-12 in the timetable)
+FIRST_SLOT_MINUTE = 8 * 60
+N_SLOTS = 12
+SLOT_LABELS = [f"{(FIRST_SLOT_MINUTE // 60) + i}:00" for i in range(N_SLOTS)]
+
+REPORTS = ('room_occupancy', 'teaching_load', 'peak_hours')
+
+def slots_for(time_slot):
+    """Slot indexes covered by an "H:MM-H:MM" time slot"""
+    time_range = parse_time_range(time_slot)
+    if time_range is None:
+        return []
+    start = (time_range[0] - FIRST_SLOT_MINUTE) // 60
+    end = (time_range[1] - 1 - FIRST_SLOT_MINUTE) // 60
+    return [slot for slot in range(start, end + 1) if 0 <= slot < N_SLOTS]
+
+class UtilizationAnalytics:
+    """Occupancy tensors plus cached reports computed from them"""
+
+    def __init__(self, classes, registry=None):
+        """Build tensors from (instructor, day, class_info) triples"""
+        self.registry = registry
+        self._reports = {}
+        self._lock = threading.Lock()
+
+        room_ids = {}
+        instructor_ids = {}
+        room_idx, instr_idx, day_idx, slot_idx = [], [], [], []
+
+        for instructor, day, class_info in classes:
+            if day not in DAYS:
+                continue
+            room = class_info.get('room') or ''
+            for slot in slots_for(class_info.get('time')):
+                instr_idx.append(instructor_ids.setdefault(instructor, len(instructor_ids)))
+                room_idx.append(room_ids.setdefault(room, len(room_ids)) if room else -1)
+                day_idx.append(DAYS.index(day))
+                slot_idx.append(slot)
+
+        self.rooms = list(room_ids)
+        self.instructors = list(instructor_ids)
+
+        room_idx = np.asarray(room_idx, dtype=np.int64)
+        instr_idx = np.asarray(instr_idx, dtype=np.int64)
+        day_idx = np.asarray(day_idx, dtype=np.int64)
+        slot_idx = np.asarray(slot_idx, dtype=np.int64)
+
+        # Cells count classes, so values above 1 mean double bookings
+        self.room_tensor = np.zeros((len(self.rooms), len(DAYS), N_SLOTS), dtype=np.int32)
+        has_room = room_idx >= 0
+        np.add.at(self.room_tensor, (room_idx[has_room], day_idx[has_room], slot_idx[has_room]), 1)
+
+        self.instructor_tensor = np.zeros((len(self.instructors), len(DAYS), N_SLOTS), dtype=np.int32)
+        np.add.at(self.instructor_tensor, (instr_idx, day_idx, slot_idx), 1)
+
+    def __getstate__(self):
+        # Locks and the metrics registry stay with the process (see index_cache.py)
+        state = self.__dict__.copy()
+        del state['_lock']
+        state['registry'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def report(self, name):
+        """Return a cached report by name; raises KeyError for unknown reports"""
+        if name not in REPORTS:
+            raise KeyError(name)
+        cached = self._reports.get(name)
+        if self.registry is not None:
+            self.registry.record_cache('analytics', cached is not None)
+        if cached is None:
+            cached = getattr(self, name)()
+            with self._lock:
+                self._reports[name] = cached
+        return cached
+
+    def room_occupancy(self, top=20):
+        """Share of rooms in use per hour, and the busiest rooms"""
+        busy = self.room_tensor > 0
+        by_hour = busy.mean(axis=(0, 1)) if len(self.rooms) else np.zeros(N_SLOTS)
+        by_day_hour = busy.mean(axis=0) if len(self.rooms) else np.zeros((len(DAYS), N_SLOTS))
+        per_room = busy.sum(axis=(1, 2))
+        order = np.argsort(-per_room, kind='stable')[:top]
+
+        return {
+            'rooms': len(self.rooms),
+            'slots': SLOT_LABELS,
+            'occupancy_by_hour': [round(float(v), 4) for v in by_hour],
+            'occupancy_by_day_hour': {day: [round(float(v), 4) for v in row] for day, row in zip(DAYS, by_day_hour)},
+            'busiest_rooms': [{'room': self.rooms[i], 'hours_per_week': int(per_room[i]),
+                               'utilization': round(float(per_room[i]) / (len(DAYS) * N_SLOTS), 4)}
+                              for i in order]
+        }
+
+    def teaching_load(self, top=20):
+        """Distribution of weekly teaching hours per instructor"""
+        hours = (self.instructor_tensor > 0).sum(axis=(1, 2))
+        if not len(hours):
+            return {'instructors': 0}
+        percentiles = np.percentile(hours, [10, 25, 50, 75, 90])
+        order = np.argsort(-hours, kind='stable')[:top]
+
+        return {
+            'instructors': len(self.instructors),
+            'mean_hours': round(float(hours.mean()), 2),
+            'percentiles': {p: float(v) for p, v in zip(('p10', 'p25', 'p50', 'p75', 'p90'), percentiles)},
+            'histogram': {str(h): int(c) for h, c in enumerate(np.bincount(hours)) if c},
+            'conflicting_slots': int((self.instructor_tensor > 1).sum()),
+            'highest_load': [{'instructor': self.instructors[i], 'hours_per_week': int(hours[i])} for i in order]
+        }
+
+    def peak_hours(self, top=10):
+        """Rooms in use per day and hour, highest first"""
+        in_use = (self.room_tensor > 0).sum(axis=0)
+        double_booked = (self.room_tensor > 1).sum(axis=0)
+        flat = np.argsort(-in_use, axis=None, kind='stable')[:top]
+        days, slots = np.unravel_index(flat, in_use.shape)
+
+        return {
+            'slots': SLOT_LABELS,
+            'rooms_in_use': {day: [int(v) for v in row] for day, row in zip(DAYS, in_use)},
+            'peaks': [{'day': DAYS[d], 'slot': SLOT_LABELS[s], 'rooms_in_use': int(in_use[d, s]),
+                       'double_booked_rooms': int(double_booked[d, s])}
+                      for d, s in zip(days, slots)]
+        }
+
+def classes_from_data(data):
+    """(instructor, day, class_info) triples from structured_data.json contents"""
+    for prof_name, prof_data in data.get('professors', {}).items():
+        for day, entries in prof_data.get('schedule', {}).items():
+            for class_info in entries:
+                yield prof_name, day, class_info
+
+def main():
+    """Print a utilization report as JSON"""
+    parser = argparse.ArgumentParser(description="Room and faculty utilization reports")
+    parser.add_argument('report', nargs='?', choices=REPORTS, help="Report to print (default: all)")
+    parser.add_argument('--data', default='structured_data.json', help="Structured data JSON file")
+    args = parser.parse_args()
+
+    with open(args.data, 'r', encoding='utf-8') as f:
+        analytics = UtilizationAnalytics(classes_from_data(json.load(f)))
+
+    names = [args.report] if args.report else REPORTS
+    print(json.dumps({name: analytics.report(name) for name in names}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,100 @@
 from flask import Flask, render_template, request, jsonify
 import json
-from datetime import datetime, timedelta
+import os
+from datetime import datetime, timedelta, timezone
 import re
+import threading
+from metrics import REGISTRY, install_metrics
+from profiling import install_profiling
+from admission import install_admission_control
+from schedule_store import DictStore
+from sqlite_backend import SQLiteStore
+from shared_index import SharedIndexStore
+from ical_feeds import FeedCache, professor_events, room_events, course_events
+from projection import compact_payload, parse_fields
+from analytics import REPORTS as ANALYTICS_REPORTS, UtilizationAnalytics
+from entity_resolution import ALIASES_FILE, AliasTable, load_aliases
+from rooms import RoomIndex
+from timeslots import parse_time_range
+from compression import install_compression
+from index_cache import cache_writable, load_index_cache, rebuild_in_background
 
 app = Flask(__name__)
+install_metrics(app)
+install_admission_control(app, REGISTRY)
+install_profiling(app)
 
-# Load the structured data
-with open('structured_data.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+# Storage backend: "json" (default) loads structured_data.json into memory,
+# "sqlite" queries the database built by sqlite_backend.py, "shared" maps the
+# index built by shared_index.py (see gunicorn.conf.py)
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'json')
 
-professors = data['professors']
-courses = data['courses']
+warm_indexes = None
+
+if STORAGE_BACKEND == 'sqlite':
+    data_path = os.environ.get('SQLITE_DB_PATH', 'structured_data.db')
+    store = SQLiteStore(data_path)
+    warm_indexes = load_index_cache(data_path, REGISTRY)
+elif STORAGE_BACKEND == 'shared':
+    data_path = os.environ.get('SHARED_INDEX_PATH', 'structured_data.idx')
+    store = SharedIndexStore(data_path)
+    warm_indexes = load_index_cache(data_path, REGISTRY)
+else:
+    data_path = 'structured_data.json'
+    # Derived indexes saved by an earlier start for this exact data file
+    with REGISTRY.timed('data_load_duration_seconds', (('source', 'index_cache'),)):
+        warm_indexes = load_index_cache(data_path, REGISTRY)
+    if warm_indexes is not None:
+        store = warm_indexes['store']
+    else:
+        # Load the structured data
+        with REGISTRY.timed('data_load_duration_seconds'):
+            with open(data_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        store = DictStore(data)
+
+# Version of the loaded data, used to key caches of rendered output
+data_stat = os.stat(data_path)
+DATA_VERSION = f"{int(data_stat.st_mtime)}-{data_stat.st_size}"
+DATA_LAST_MODIFIED = datetime.fromtimestamp(int(data_stat.st_mtime), timezone.utc)
+
+ical_cache = FeedCache(DATA_VERSION, DATA_LAST_MODIFIED, REGISTRY)
+
+# Compressed responses are cached per data version; also serves the
+# precompressed data files written by prepare_deployment.py
+install_compression(app, DATA_VERSION, REGISTRY, static_root=os.path.dirname(os.path.abspath(__file__)))
+
+# Name variants merged during ingestion (see entity_resolution.py)
+alias_table = AliasTable(load_aliases(ALIASES_FILE))
+
+# Utilization tensors for this data version, from the warm-start cache or built on first use
+analytics_engine = None
+analytics_lock = threading.Lock()
+
+# Room hierarchy and occupancy bitsets, from the warm-start cache or built on first use
+room_index = None
+room_index_lock = threading.Lock()
+
+def adopt_indexes(indexes):
+    """Use indexes built on the warm-start rebuild thread unless a request already built them"""
+    global analytics_engine, room_index
+    with analytics_lock:
+        if analytics_engine is None:
+            analytics_engine = indexes['analytics']
+    with room_index_lock:
+        if room_index is None:
+            room_index = indexes['rooms']
+
+# Start from cached indexes, or rebuild them (and the cache) off the request path;
+# without a writable cache location they are built lazily on first use instead
+if warm_indexes is not None:
+    adopt_indexes(warm_indexes)
+elif os.path.exists(data_path) and cache_writable(data_path):
+    rebuild_in_background(data_path, store, adopt_indexes, REGISTRY)
+
+# Fields of /api/professor_info responses, in response order
+PROFESSOR_INFO_FIELDS = ('name', 'current_status', 'upcoming_classes', 'all_classes_today',
+                         'current_day', 'current_time')
 
 def get_current_day():
     """Get current day name"""
@@ -25,33 +109,30 @@ def is_time_in_slot(current_time, time_slot):
     if not time_slot or '-' not in time_slot:
         return False
     
+    # Slots have no AM/PM and may cross noon ("12:00-1:50"); current_time is 24-hour
+    time_range = parse_time_range(time_slot)
+    if time_range is None:
+        return False
+    
     try:
-        start_time, end_time = time_slot.split('-')
-        start_hour, start_min = map(int, start_time.split(':'))
-        end_hour, end_min = map(int, end_time.split(':'))
-        
         current_hour, current_min = map(int, current_time.split(':'))
-        
-        start_total_min = start_hour * 60 + start_min
-        end_total_min = end_hour * 60 + end_min
-        current_total_min = current_hour * 60 + current_min
-        
-        return start_total_min <= current_total_min <= end_total_min
-    except:
+    except ValueError:
         return False
+    
+    return time_range[0] <= current_hour * 60 + current_min <= time_range[1]
 
 def get_professor_current_location(prof_name):
     """Get professor's current location and class"""
-    if prof_name not in professors:
+    if not store.has_professor(prof_name):
         return None
     
     current_day = get_current_day()
     current_time = get_current_time()
     
-    prof_data = professors[prof_name]
+    todays_classes = store.get_day_schedule(prof_name, current_day)
     
     # Check if professor has classes today
-    if current_day not in prof_data['schedule']:
+    if todays_classes is None:
         return {
             'status': 'No classes today',
             'current_class': None,
@@ -60,7 +141,7 @@ def get_professor_current_location(prof_name):
     
     # Find current class
     current_class = None
-    for class_info in prof_data['schedule'][current_day]:
+    for class_info in todays_classes:
         if is_time_in_slot(current_time, class_info['time']):
             current_class = class_info
             break
@@ -80,7 +161,7 @@ def get_professor_current_location(prof_name):
 
 def get_upcoming_classes(prof_name, limit=3):
     """Get upcoming classes for today"""
-    if prof_name not in professors:
+    if not store.has_professor(prof_name):
         return []
     
     current_day = get_current_day()
@@ -88,53 +169,48 @@ def get_upcoming_classes(prof_name, limit=3):
     current_hour, current_min = map(int, current_time.split(':'))
     current_total_min = current_hour * 60 + current_min
     
-    prof_data = professors[prof_name]
+    todays_classes = store.get_day_schedule(prof_name, current_day)
     
-    if current_day not in prof_data['schedule']:
+    if todays_classes is None:
         return []
     
     upcoming = []
-    for class_info in prof_data['schedule'][current_day]:
-        if not class_info['time'] or '-' not in class_info['time']:
-            continue
-            
-        try:
-            start_time = class_info['time'].split('-')[0]
-            start_hour, start_min = map(int, start_time.split(':'))
-            start_total_min = start_hour * 60 + start_min
-            
-            if start_total_min > current_total_min:
-                upcoming.append(class_info)
-        except:
-            continue
+    for class_info in todays_classes:
+        time_range = parse_time_range(class_info['time'])
+        if time_range is not None and time_range[0] > current_total_min:
+            upcoming.append(class_info)
     
     return upcoming[:limit]
 
+def get_analytics():
+    """Get the analytics engine, building it on first use"""
+    global analytics_engine
+    if analytics_engine is None:
+        with analytics_lock:
+            if analytics_engine is None:
+                with REGISTRY.timed('index_build_duration_seconds', (('index', 'analytics'),)):
+                    analytics_engine = UtilizationAnalytics(store.iter_classes(), REGISTRY)
+    return analytics_engine
+
+def get_room_index():
+    """Get the room index, building it on first use"""
+    global room_index
+    if room_index is None:
+        with room_index_lock:
+            if room_index is None:
+                with REGISTRY.timed('index_build_duration_seconds', (('index', 'rooms'),)):
+                    room_index = RoomIndex(store.iter_classes(), store.get_room_table())
+    return room_index
+
+def resolve_professor_name(prof_name):
+    """Map a merged name variant to the professor's canonical name"""
+    if store.has_professor(prof_name):
+        return prof_name
+    return alias_table.canonical(prof_name)
+
 def search_professors(query):
     """Search professors by name with fuzzy matching"""
-    if not query:
-        return list(professors.keys())[:10]  # Return first 10 if no query
-    
-    query = query.lower()
-    matches = []
-    
-    for prof_name in professors.keys():
-        prof_lower = prof_name.lower()
-        
-        # Exact match
-        if query == prof_lower:
-            matches.insert(0, prof_name)
-        # Starts with query
-        elif prof_lower.startswith(query):
-            matches.append(prof_name)
-        # Contains query
-        elif query in prof_lower:
-            matches.append(prof_name)
-        # Word-wise matching
-        elif any(word.startswith(query) for word in prof_lower.split()):
-            matches.append(prof_name)
-    
-    return matches[:10]  # Limit to 10 results
+    return alias_table.expand_search(query, store.search_professors(query))
 
 @app.route('/')
 def index():
@@ -150,32 +226,141 @@ def api_search_professors():
 
 @app.route('/api/professor_info/<prof_name>')
 def api_professor_info(prof_name):
-    """API endpoint for professor information"""
-    if prof_name not in professors:
+    """API endpoint for professor information
+
+    Optional query parameters: fields=<comma-separated field names> computes
+    only those fields, compact=1 returns class entries as string-table rows
+    (upcoming_classes as indexes into all_classes_today when both are selected).
+    """
+    prof_name = resolve_professor_name(prof_name)
+    if not store.has_professor(prof_name):
         return jsonify({'error': 'Professor not found'}), 404
     
-    current_location = get_professor_current_location(prof_name)
-    upcoming_classes = get_upcoming_classes(prof_name)
-    all_classes_today = professors[prof_name]['schedule'].get(get_current_day(), [])
+    try:
+        fields = parse_fields(request.args.get('fields'), PROFESSOR_INFO_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Only the selected fields are computed
+    builders = {
+        'name': lambda: prof_name,
+        'current_status': lambda: get_professor_current_location(prof_name),
+        'upcoming_classes': lambda: get_upcoming_classes(prof_name),
+        'all_classes_today': lambda: store.get_day_schedule(prof_name, get_current_day()) or [],
+        'current_day': get_current_day,
+        'current_time': get_current_time
+    }
+    payload = {field: builders[field]() for field in fields}
+    
+    if request.args.get('compact') == '1':
+        payload = compact_payload(payload)
+    
+    return jsonify(payload)
+
+@app.route('/api/search_courses')
+def api_search_courses():
+    """API endpoint for course search by number or title"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify([])
+    return jsonify(store.search_courses(query))
+
+@app.route('/api/room/<room>')
+def api_room_schedule(room):
+    """API endpoint for the classes held in a room on a day (default: today)"""
+    day = request.args.get('day', get_current_day())
+    return jsonify({
+        'room': room,
+        'day': day,
+        'classes': store.get_room_schedule(room, day)
+    })
+
+@app.route('/api/course/<code>')
+def api_course_sections(code):
+    """API endpoint for all sections of a course"""
+    sections = store.get_course_sections(code)
+    if not sections:
+        return jsonify({'error': 'Course not found'}), 404
+    return jsonify({
+        'code': code,
+        'sections': sections
+    })
+
+@app.route('/api/analytics/<report>')
+def api_analytics(report):
+    """API endpoint for room and faculty utilization reports"""
+    if report not in ANALYTICS_REPORTS:
+        return jsonify({'error': 'Unknown report', 'reports': list(ANALYTICS_REPORTS)}), 404
+    return jsonify(get_analytics().report(report))
+
+@app.route('/api/nearest_free_room')
+def api_nearest_free_room():
+    """API endpoint for the closest rooms with no class at a time
+
+    Query parameters: from=<room code> (required), day=<day name> and
+    hour=<HH:MM or hour of day> (default: now), limit=<count> (default 5).
+    """
+    origin = request.args.get('from', '').strip()
+    if not origin:
+        return jsonify({'error': 'Missing from= room code'}), 400
+    day = request.args.get('day', get_current_day())
+    hour = request.args.get('hour', get_current_time())
+    
+    try:
+        if ':' in hour:
+            hours, minutes = map(int, hour.split(':'))
+        else:
+            hours, minutes = int(hour), 0
+        limit = max(1, min(int(request.args.get('limit', 5)), 50))
+    except ValueError:
+        return jsonify({'error': 'hour must be HH:MM or an hour of day, limit a number'}), 400
+    if not (0 <= hours <= 23 and 0 <= minutes <= 59):
+        return jsonify({'error': 'hour must be between 0:00 and 23:59'}), 400
+    
+    try:
+        rooms = get_room_index().nearest_free(origin, day, hours * 60 + minutes, limit)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'name': prof_name,
-        'current_status': current_location,
-        'upcoming_classes': upcoming_classes,
-        'all_classes_today': all_classes_today,
-        'current_day': get_current_day(),
-        'current_time': get_current_time()
+        'from': origin,
+        'day': day,
+        'hour': f"{hours}:{minutes:02d}",
+        'rooms': rooms
     })
 
+@app.route('/ical/professor/<prof_name>.ics')
+def ical_professor(prof_name):
+    """Weekly calendar feed of a professor's classes"""
+    prof_name = resolve_professor_name(prof_name)
+    response = ical_cache.response(request, 'professor', prof_name,
+                                   lambda: professor_events(store, prof_name))
+    return response or ("Professor not found", 404)
+
+@app.route('/ical/room/<room>.ics')
+def ical_room(room):
+    """Weekly calendar feed of the classes held in a room"""
+    response = ical_cache.response(request, 'room', room, lambda: room_events(store, room))
+    return response or ("Room not found", 404)
+
+@app.route('/ical/course/<code>.ics')
+def ical_course(code):
+    """Weekly calendar feed of every section of a course"""
+    # One cache entry per course however the code is spelled
+    code = code.strip().upper()
+    response = ical_cache.response(request, 'course', code, lambda: course_events(store, code))
+    return response or ("Course not found", 404)
+
 @app.route('/professor/<prof_name>')
 def professor_detail(prof_name):
     """Professor detail page"""
-    if prof_name not in professors:
+    prof_name = resolve_professor_name(prof_name)
+    if not store.has_professor(prof_name):
         return "Professor not found", 404
     
     current_location = get_professor_current_location(prof_name)
     upcoming_classes = get_upcoming_classes(prof_name)
-    all_classes_today = professors[prof_name]['schedule'].get(get_current_day(), [])
+    all_classes_today = store.get_day_schedule(prof_name, get_current_day()) or []
     
     return render_template('professor.html', 
                          professor_name=prof_name,
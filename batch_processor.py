@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Batch Data Processor for BITS Pilani Timetable
+Parses many timetable CSV files (per department, per campus, supplements) in parallel
+and merges them into a single structured_data.json
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from comprehensive_data_processor import process_csv_data, save_data, print_statistics
+from entity_resolution import resolve_entities
+from rooms import add_room_table
+
+def find_csv_files(source):
+    """Expand a directory or glob pattern into a sorted list of CSV files"""
+    if os.path.isdir(source):
+        pattern = os.path.join(source, '*.csv')
+    else:
+        pattern = source
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+def process_file(csv_file_path):
+    """Worker entry point: parse one CSV file and time it"""
+    start = time.perf_counter()
+    structured_data = process_csv_data(csv_file_path, verbose=False)
+    elapsed = time.perf_counter() - start
+    return csv_file_path, structured_data, elapsed
+
+def class_key(class_info):
+    """Identity of a class entry, used to drop duplicates across files"""
+    return (
+        class_info['course_code'],
+        class_info['section'],
+        class_info.get('instructor', ''),
+        tuple(class_info['days']),
+        tuple(class_info['time_slots'])
+    )
+
+def schedule_key(entry):
+    """Identity of a daily schedule entry"""
+    return (entry['time'], entry['course_code'], entry['section'], entry['room'])
+
+def merge_unique(target, values):
+    """Append values missing from target, keeping first-seen order"""
+    for value in values:
+        if value not in target:
+            target.append(value)
+
+def merge_course(existing, incoming):
+    """Resolve a duplicate section: keep the first file's data, fill gaps from later files"""
+    if existing == incoming:
+        return False
+
+    if not existing['room'] and incoming['room']:
+        existing['room'] = incoming['room']
+    merge_unique(existing['days'], incoming['days'])
+    merge_unique(existing['time_slots'], incoming['time_slots'])
+    merge_unique(existing['instructors'], incoming['instructors'])
+    return True
+
+def merge_professor(existing, incoming):
+    """Merge one professor's classes and schedule, dropping repeated entries"""
+    seen = {class_key(c) for c in existing['current_classes']}
+    for class_info in incoming['current_classes']:
+        key = class_key(class_info)
+        if key not in seen:
+            seen.add(key)
+            existing['current_classes'].append(class_info)
+
+    for day, entries in incoming['schedule'].items():
+        day_entries = existing['schedule'].setdefault(day, [])
+        seen = {schedule_key(e) for e in day_entries}
+        for entry in entries:
+            key = schedule_key(entry)
+            if key not in seen:
+                seen.add(key)
+                day_entries.append(entry)
+
+def merge_results(results):
+    """Merge per-file results in input order so the output does not depend on worker timing"""
+    professors = {}
+    courses = {}
+    conflicts = 0
+
+    for _, structured_data, _ in results:
+        for course_key, course in structured_data['courses'].items():
+            if course_key not in courses:
+                courses[course_key] = course
+            elif merge_course(courses[course_key], course):
+                conflicts += 1
+
+        for prof_name, prof_data in structured_data['professors'].items():
+            if prof_name not in professors:
+                professors[prof_name] = prof_data
+            else:
+                merge_professor(professors[prof_name], prof_data)
+
+    return {'professors': professors, 'courses': courses}, conflicts
+
+def process_files(csv_files, workers=None):
+    """Parse files on a process pool and return results in input order"""
+    if workers == 1:
+        return [process_file(path) for path in csv_files]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(process_file, csv_files))
+
+def print_timings(results, wall_time):
+    """Print per-file parse timings"""
+    print("\n" + "="*50)
+    print("PER-FILE TIMING")
+    print("="*50)
+    for path, structured_data, elapsed in results:
+        print(f"{elapsed:8.2f}s  {len(structured_data['courses']):5d} sections  {path}")
+
+    cpu_time = sum(elapsed for _, _, elapsed in results)
+    print(f"\nWall time: {wall_time:.2f}s (sum of per-file time: {cpu_time:.2f}s)")
+    print("="*50)
+
+def main():
+    """Main processing function"""
+    parser = argparse.ArgumentParser(description="Parse timetable CSV files in parallel")
+    parser.add_argument('source', help="Directory of CSV files or a glob pattern")
+    parser.add_argument('-o', '--output', default='structured_data.json', help="Output JSON file")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(),
+                        help="Number of worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    csv_files = find_csv_files(args.source)
+    if not csv_files:
+        print(f"❌ No CSV files found for: {args.source}")
+        sys.exit(1)
+
+    print(f"Processing {len(csv_files)} files with {args.workers} workers")
+
+    start = time.perf_counter()
+    results = process_files(csv_files, args.workers)
+    structured_data, conflicts = merge_results(results)
+    wall_time = time.perf_counter() - start
+
+    print_timings(results, wall_time)
+    print(f"Duplicate sections merged across files: {conflicts}")
+    structured_data = add_room_table(resolve_entities(structured_data))
+    print_statistics(structured_data)
+    save_data(structured_data, args.output)
+
+    print(f"\n✅ Processed {len(csv_files)} files into {args.output}")
+
+if __name__ == "__main__":
+    main()
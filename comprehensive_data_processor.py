@@ -10,22 +10,9 @@ import json
 import re
 from collections import defaultdict
 
-# Hour to time mapping based on the CSV data analysis
-HOUR_MAPPING = {
-    1: "8:00-8:50",
-    2: "9:00-9:50", 
-    3: "10:00-10:50",
-    4: "11:00-11:50",
-    5: "12:00-12:50",
-    6: "1:00-1:50",
-    7: "2:00-2:50",
-    8: "3:00-3:50",
-    9: "4:00-4:50",
-    10: "5:00-5:50",  # This is the tutorial time you mentioned!
-    11: "6:00-6:50",
-    12: "7:00-7:50",
-    67: "2:00-4:50"  # Lab sessions are longer
-}
+from entity_resolution import resolve_entities
+from rooms import add_room_table
+from timeslots import parse_hour_code
 
 # Day abbreviations mapping
 DAY_MAPPING = {
@@ -43,6 +30,14 @@ def clean_text(text):
         return ""
     return str(text).strip().replace('\n', ' ').replace('\r', ' ')
 
+def format_comp_code(value):
+    """Course code as text; numeric codes use pandas' float form ("2422.0") in every processor"""
+    code = clean_text(value)
+    try:
+        return str(float(code)) if code else code
+    except ValueError:
+        return code
+
 def parse_days(day_str):
     """Parse day string into list of full day names"""
     if pd.isna(day_str) or day_str == '':
@@ -68,18 +63,13 @@ def parse_days(day_str):
     
     return days
 
-def get_time_from_hour(hour):
-    """Convert hour number to time string"""
-    if pd.isna(hour) or hour == '':
-        return ""
-    
-    try:
-        hour_num = int(float(hour))
-        return HOUR_MAPPING.get(hour_num, f"Unknown-{hour}")
-    except (ValueError, TypeError):
-        return ""
+def get_time_slots(hours):
+    """Convert an hour code to merged time intervals, one per session"""
+    if pd.isna(hours) or hours == '':
+        return []
+    return parse_hour_code(hours)
 
-def process_csv_data(csv_file_path):
+def process_csv_data(csv_file_path, verbose=True):
     """Process the CSV file and extract all class data"""
     print(f"Reading CSV file: {csv_file_path}")
     
@@ -101,7 +91,7 @@ def process_csv_data(csv_file_path):
     
     for index, row in df.iterrows():
         # Clean the data
-        comp_code = clean_text(row.get('COMP CODE', ''))
+        comp_code = format_comp_code(row.get('COMP CODE', ''))
         course_no = clean_text(row.get('COURSE NO.', ''))
         course_title = clean_text(row.get('COURSE TITLE', ''))
         section = clean_text(row.get('SEC', ''))
@@ -118,15 +108,16 @@ def process_csv_data(csv_file_path):
                 'course_title': course_title
             }
             current_course_data = current_course
-            print(f"Processing course: {course_title} ({course_no})")
+            if verbose:
+                print(f"Processing course: {course_title} ({course_no})")
         
         # Process class entry (L, T, P sections) - can be for current course or continuation row
         if section and instructor and current_course_data:
             days = parse_days(days_str)
-            time_slot = get_time_from_hour(hours)
+            time_slots = get_time_slots(hours)
             
             # Skip if no meaningful schedule data
-            if not days and not time_slot:
+            if not days and not time_slots:
                 continue
             
             # Create class info
@@ -138,7 +129,7 @@ def process_csv_data(csv_file_path):
                 'room': room,
                 'instructor': instructor,
                 'days': days,
-                'time_slots': [time_slot] if time_slot else [],
+                'time_slots': time_slots,
                 'raw_hours': hours
             }
             
@@ -151,7 +142,8 @@ def process_csv_data(csv_file_path):
             elif section.startswith('P'):
                 class_type = 'Practical'
             
-            print(f"  → {class_type} {section}: {instructor} on {', '.join(days)} at {time_slot}")
+            if verbose:
+                print(f"  → {class_type} {section}: {instructor} on {', '.join(days)} at {', '.join(time_slots)}")
             
             # Add to courses data
             course_key = f"{current_course_data['comp_code']}_{section}"
@@ -162,7 +154,7 @@ def process_csv_data(csv_file_path):
                 'section': section,
                 'room': room,
                 'days': days,
-                'time_slots': [time_slot] if time_slot else [],
+                'time_slots': time_slots,
                 'instructors': [instructor]
             }
             
@@ -186,17 +178,18 @@ def process_csv_data(csv_file_path):
                 # Add to current classes
                 professors_data[instructor]['current_classes'].append(class_info)
                 
-                # Add to daily schedule
+                # Add to daily schedule, one entry per session
                 for day in days:
                     if day in professors_data[instructor]['schedule']:
-                        schedule_entry = {
-                            'time': time_slot,
-                            'course_code': current_course_data['comp_code'],
-                            'course_title': current_course_data['course_title'],
-                            'section': section,
-                            'room': room
-                        }
-                        professors_data[instructor]['schedule'][day].append(schedule_entry)
+                        for time_slot in time_slots or [""]:
+                            schedule_entry = {
+                                'time': time_slot,
+                                'course_code': current_course_data['comp_code'],
+                                'course_title': current_course_data['course_title'],
+                                'section': section,
+                                'room': room
+                            }
+                            professors_data[instructor]['schedule'][day].append(schedule_entry)
     
     print(f"Processed {len(professors_data)} professors")
     print(f"Processed {len(courses_data)} course sections")
@@ -253,6 +246,12 @@ def main():
         csv_file = 'Data (1).csv'
         structured_data = process_csv_data(csv_file)
         
+        # Merge duplicate instructor names and update the alias table
+        structured_data = resolve_entities(structured_data)
+        
+        # Parse room codes into the building/floor hierarchy
+        structured_data = add_room_table(structured_data)
+        
         # Print statistics
         print_statistics(structured_data)
         
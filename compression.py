@@ -0,0 +1,209 @@
+"""
+Response compression for the Professor Locator Flask apps
+Negotiates Accept-Encoding, serves the .br/.gz variants that
+prepare_deployment.py writes next to static data files (compressing the file
+on the fly when no fresh variant exists), and compresses JSON and HTML
+responses above a size threshold. Compressed bytes are kept in an
+LRU keyed by data version, body digest and encoding, so identical responses
+are only compressed once per dataset.
+
+Brotli is used when the optional `brotli` package is installed; gzip is
+always available.
+
+Environment variables:
+    COMPRESSION_MIN_BYTES     smallest response body worth compressing (default: 1024)
+    COMPRESSION_CACHE_SIZE    compressed bodies kept in memory (default: 256)
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+
+from flask import Response, abort, request, send_file
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# File suffix of each precompressed variant, in order of preference
+VARIANT_SUFFIXES = (('br', '.br'), ('gzip', '.gz'))
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html')
+
+def available_encodings():
+    """Encodings this process can produce, most preferred first"""
+    return [encoding for encoding, _ in VARIANT_SUFFIXES if encoding != 'br' or brotli is not None]
+
+def compress(body, encoding, best=False):
+    """Compress bytes with one of available_encodings(); best=True trades speed for size"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=11 if best else 5)
+    # mtime=0 keeps the output identical across runs
+    return gzip.compress(body, compresslevel=9 if best else 6, mtime=0)
+
+def negotiate(accept_encoding, offered):
+    """Pick the offered encoding the client accepts with the highest q-value, or None"""
+    weights = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best = None
+    for rank, encoding in enumerate(offered):
+        q = weights.get(encoding, weights.get('*', 0.0))
+        # Ties go to the earlier (preferred) encoding
+        if q > 0 and (best is None or q > best[0]):
+            best = (q, rank, encoding)
+    return best[2] if best else None
+
+def precompress_file(path):
+    """Write .br (if available) and .gz variants of a file; returns the paths written"""
+    with open(path, 'rb') as f:
+        body = f.read()
+
+    written = []
+    for encoding, suffix in VARIANT_SUFFIXES:
+        if encoding in available_encodings():
+            with open(path + suffix, 'wb') as f:
+                f.write(compress(body, encoding, best=True))
+            written.append(path + suffix)
+    return written
+
+def remove_stale_variants(directory):
+    """Delete .br/.gz files whose original no longer exists"""
+    for root, _, files in os.walk(directory):
+        for name in files:
+            for _, suffix in VARIANT_SUFFIXES:
+                if name.endswith(suffix) and not os.path.exists(os.path.join(root, name[:-len(suffix)])):
+                    os.remove(os.path.join(root, name))
+
+class CompressedCache:
+    """Bounded LRU of compressed response bodies"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+def send_precompressed(path, cache=None, registry=None):
+    """Send a file, or its best precompressed variant the client accepts
+
+    Without a fresh variant the client accepts, compressible files are
+    compressed on the fly and kept in cache (a CompressedCache) if given.
+    """
+    if not os.path.isfile(path):
+        abort(404)
+
+    # Variants older than the file are stale and never served
+    mtime = os.path.getmtime(path)
+    variants = {encoding: path + suffix for encoding, suffix in VARIANT_SUFFIXES
+                if os.path.isfile(path + suffix) and os.path.getmtime(path + suffix) >= mtime}
+    encoding = negotiate(request.headers.get('Accept-Encoding'), list(variants))
+
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if encoding is None and cache is not None and mimetype in COMPRESSIBLE_MIMETYPES:
+        encoding = negotiate(request.headers.get('Accept-Encoding'), available_encodings())
+        if encoding is not None:
+            return _send_compressed_file(path, mimetype, encoding, cache, registry)
+
+    response = send_file(variants.get(encoding, path), mimetype=mimetype, conditional=True)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers.add('Vary', 'Accept-Encoding')
+    return response
+
+def _send_compressed_file(path, mimetype, encoding, cache, registry=None):
+    """Compress a file in memory, once per file version and encoding"""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size, encoding)
+    compressed = cache.get(key)
+    if registry is not None:
+        registry.record_cache('compression', compressed is not None)
+    if compressed is None:
+        with open(path, 'rb') as f:
+            compressed = compress(f.read(), encoding)
+        cache.put(key, compressed)
+
+    response = Response(compressed, mimetype=mimetype)
+    response.headers['Content-Encoding'] = encoding
+    response.headers.add('Vary', 'Accept-Encoding')
+    response.set_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}-{encoding}")
+    response.last_modified = int(stat.st_mtime)
+    return response.make_conditional(request)
+
+def install_compression(app, data_version, registry=None, static_root=None, environ=os.environ):
+    """Compress dynamic responses and serve precompressed data files from static_root"""
+    min_bytes = int(environ.get('COMPRESSION_MIN_BYTES', '1024'))
+    cache = CompressedCache(int(environ.get('COMPRESSION_CACHE_SIZE', '256')))
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code != 200 or response.direct_passthrough
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        response.headers.add('Vary', 'Accept-Encoding')
+        body = response.get_data()
+        if len(body) < min_bytes:
+            return response
+        encoding = negotiate(request.headers.get('Accept-Encoding'), available_encodings())
+        if encoding is None:
+            return response
+
+        key = (data_version, hashlib.sha1(body).digest(), encoding)
+        compressed = cache.get(key)
+        if registry is not None:
+            registry.record_cache('compression', compressed is not None)
+        if compressed is None:
+            compressed = compress(body, encoding)
+            cache.put(key, compressed)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    if static_root is not None:
+        @app.route('/structured_data.json')
+        def structured_data_file():
+            """The dataset file, precompressed when possible"""
+            return send_precompressed(os.path.join(static_root, 'structured_data.json'), cache, registry)
+
+        @app.route('/data/<path:filename>')
+        def data_file(filename):
+            """Published data versions and deltas, precompressed when possible"""
+            data_dir = os.path.normpath(os.path.join(static_root, 'data'))
+            path = os.path.normpath(os.path.join(data_dir, filename))
+            if not path.startswith(data_dir + os.sep):
+                abort(404)
+            return send_precompressed(path, cache, registry)
+
+    return cache
@@ -0,0 +1,171 @@
+// Background data loader for the static site.
+// Keeps the dataset in IndexedDB, fetches only the deltas published since the
+// cached version (see prepare_deployment.py), and builds the search structures
+// off the UI thread.
+
+const DB_NAME = 'professor-locator';
+const DB_STORE = 'dataset';
+const CACHE_KEY = 'current';
+
+function openDatabase() {
+    return new Promise((resolve, reject) => {
+        const request = indexedDB.open(DB_NAME, 1);
+        request.onupgradeneeded = () => request.result.createObjectStore(DB_STORE);
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+async function readCache() {
+    const db = await openDatabase();
+    return new Promise((resolve, reject) => {
+        const request = db.transaction(DB_STORE, 'readonly').objectStore(DB_STORE).get(CACHE_KEY);
+        request.onsuccess = () => resolve(request.result || null);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+async function writeCache(record) {
+    const db = await openDatabase();
+    return new Promise((resolve, reject) => {
+        const tx = db.transaction(DB_STORE, 'readwrite');
+        tx.objectStore(DB_STORE).put(record, CACHE_KEY);
+        tx.oncomplete = () => resolve();
+        tx.onerror = () => reject(tx.error);
+    });
+}
+
+async function fetchJson(url) {
+    const response = await fetch(url, { cache: 'no-cache' });
+    if (!response.ok) {
+        throw new Error(`${url}: HTTP ${response.status}`);
+    }
+    return response.json();
+}
+
+// Delta URLs leading from `version` to the manifest's current version, or null
+function deltaChain(manifest, version) {
+    const start = manifest.versions.indexOf(version);
+    if (start === -1) {
+        return null;
+    }
+    const chain = [];
+    for (let i = start; i < manifest.versions.length - 1; i++) {
+        const url = manifest.deltas[manifest.versions[i]];
+        if (!url) {
+            return null;
+        }
+        chain.push(url);
+    }
+    return chain;
+}
+
+function applyDelta(dataset, delta) {
+    for (const section of ['professors', 'courses']) {
+        const changes = delta[section];
+        const items = dataset[section];
+        for (const key of changes.remove) {
+            delete items[key];
+        }
+        Object.assign(items, changes.upsert);
+        if (changes.order) {
+            const ordered = {};
+            for (const key of changes.order) {
+                ordered[key] = items[key];
+            }
+            dataset[section] = ordered;
+        }
+    }
+    return dataset;
+}
+
+async function syncDataset() {
+    const cached = await readCache().catch(() => null);
+
+    let manifest = null;
+    try {
+        manifest = await fetchJson('./data/manifest.json');
+    } catch (error) {
+        // No published versions: behave like the original full download
+        return { version: null, dataset: await fetchJson('./structured_data.json') };
+    }
+
+    if (cached && cached.version === manifest.current) {
+        return cached;
+    }
+
+    if (cached) {
+        const chain = deltaChain(manifest, cached.version);
+        if (chain) {
+            try {
+                let dataset = cached.dataset;
+                for (const url of chain) {
+                    dataset = applyDelta(dataset, await fetchJson('./' + url));
+                }
+                const record = { version: manifest.current, dataset };
+                await writeCache(record).catch(() => {});
+                return record;
+            } catch (error) {
+                console.warn('Delta sync failed, downloading full snapshot:', error);
+            }
+        }
+    }
+
+    const record = { version: manifest.current, dataset: await fetchJson('./' + manifest.snapshot) };
+    await writeCache(record).catch(() => {});
+    return record;
+}
+
+function cleanSubject(text) {
+    return text.replace(/\n/g, ' ').replace(/\s+/g, ' ').trim();
+}
+
+// Same subject list as getUniqueSubjects() in index.html
+function buildSubjects(professors, courses) {
+    const subjects = new Set();
+    for (const prof of Object.values(professors)) {
+        for (const day of Object.values(prof.schedule || {})) {
+            for (const classInfo of day) {
+                if (classInfo.course_title) {
+                    subjects.add(cleanSubject(classInfo.course_title));
+                }
+                if (classInfo.course_code) {
+                    subjects.add(classInfo.course_code);
+                }
+            }
+        }
+    }
+    for (const course of Object.values(courses)) {
+        if (course.course_title) {
+            subjects.add(cleanSubject(course.course_title));
+        }
+        if (course.course_number) {
+            subjects.add(course.course_number);
+        }
+        if (course.course_code) {
+            subjects.add(course.course_code);
+        }
+    }
+    return Array.from(subjects).filter(s => s && s.length > 0).sort();
+}
+
+self.onmessage = async function(event) {
+    if (event.data.type !== 'load') {
+        return;
+    }
+    try {
+        const { version, dataset } = await syncDataset();
+        const professors = dataset.professors || {};
+        const courses = dataset.courses || {};
+        self.postMessage({
+            type: 'ready',
+            version,
+            professors,
+            courses,
+            professorIndex: Object.keys(professors).map(name => [name, name.toLowerCase()]),
+            subjects: buildSubjects(professors, courses)
+        });
+    } catch (error) {
+        self.postMessage({ type: 'error', message: String(error) });
+    }
+};
@@ -3,37 +3,14 @@ import json
 import re
 from datetime import datetime, timedelta
 
+from timeslots import parse_hour_code
+
 def parse_time_slot(hour_str):
-    """Convert hour number to actual time"""
-    time_mapping = {
-        '1': '8:00-8:50',
-        '2': '9:00-9:50', 
-        '3': '10:00-10:50',
-        '4': '11:00-11:50',
-        '5': '12:00-12:50',
-        '6': '1:00-1:50',
-        '7': '2:00-2:50',
-        '8': '3:00-3:50',
-        '9': '4:00-4:50',
-        '10': '5:00-5:50'
-    }
-    
+    """Convert an hour code to merged time intervals"""
     if not hour_str or pd.isna(hour_str):
         return []
     
-    hour_str = str(hour_str).strip()
-    times = []
-    
-    # Handle single hours and hour ranges
-    for hour in hour_str.split():
-        if hour in time_mapping:
-            times.append(time_mapping[hour])
-        elif len(hour) > 1:  # Handle combined hours like "78", "89", "910"
-            for i, char in enumerate(hour):
-                if char in time_mapping:
-                    times.append(time_mapping[char])
-    
-    return times
+    return parse_hour_code(hour_str)
 
 def parse_days(day_str):
     """Convert day abbreviations to full day names"""
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Differential correctness harness for the lookup engines
+Generates randomized timetables and query times, answers every query with the
+reference implementation and with each candidate engine, and reports
+mismatches and relative speed. The reference is a frozen copy of the original
+search_professors, get_professor_current_location and get_upcoming_classes
+over plain dicts, so later changes to the apps are checked against it rather
+than against themselves. Mismatches explained by a whitelisted known bug of
+the reference are counted separately and do not fail the run.
+
+The app candidates run the current api/index.py functions. The module is
+imported against an empty temporary SQLite database with the index cache off,
+so the shipped dataset is never loaded and nothing is written next to it.
+
+Usage:
+    python differential_test.py --seed 1 --timetables 5 --professors 200 --queries 2000
+    python differential_test.py --engines app,sqlite,shared --json
+"""
+
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from entity_resolution import AliasTable
+from schedule_store import DictStore
+from shared_index import SharedIndexStore, build_index
+from sqlite_backend import SQLiteStore, build_database
+from timeslots import parse_hour_code, parse_time_range
+
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+QUERY_KINDS = ('search', 'location', 'upcoming')
+
+EMPTY_ALIASES = AliasTable({})
+
+# Behaviour of the reference that candidates may fix; mismatches matching one
+# of these are reported but do not fail the run
+KNOWN_BUGS = {
+    'twelve_hour_clock': "Timetable times have no AM/PM, so the reference reads afternoon "
+                         "classes such as 1:00-1:50 as morning classes",
+    'exact_match_order': "Several exact matches (names differing only in case) come back "
+                         "in reverse data order",
+}
+
+FIRST_NAMES = ['Anil', 'Arun', 'Bibhas', 'Chetan', 'Divya', 'Kalpana', 'Karthy', 'Meera',
+               'Murari', 'Pardha', 'Pritesh', 'Ramya', 'Sajith', 'Sourav', 'Vivek', 'Y']
+LAST_NAMES = ['Das', 'Devi', 'Gupta', 'Kumar', 'Nandi', 'Panda', 'Paul', 'Priya', 'Roy',
+              'Sahatiya', 'Sharma', 'Varma', 'Vudadha', 'Yadav']
+HOUR_CODES = ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12',
+              '23', '34', '45', '67', '78', '89', '910', '1011', '1112', '6 7 8']
+ROOMS = ['A122', 'D208 B', 'F101', 'F201', 'G105', 'I212', 'J105', 'K125', 'LAB', 'WS', '']
+
+# --- Randomized inputs ---
+
+def random_name(rng, taken):
+    """A new professor name, sometimes a case variant of an existing one"""
+    if taken and rng.random() < 0.05:
+        return rng.choice(sorted(taken)).upper()
+    parts = [rng.choice(FIRST_NAMES)] + rng.sample(LAST_NAMES, rng.randint(1, 2))
+    return ' '.join(parts)
+
+def random_time(rng):
+    """A schedule time: usually a parsed hour code, sometimes empty or unparsed"""
+    roll = rng.random()
+    if roll < 0.03:
+        return ''
+    if roll < 0.06:
+        return f"Unknown-{rng.choice(HOUR_CODES)}"
+    return parse_hour_code(rng.choice(HOUR_CODES))[0]
+
+def generate_timetable(rng, n_professors):
+    """A structured_data.json style dataset with random professors, courses and meetings"""
+    professors = {}
+    courses = {}
+
+    while len(professors) < n_professors:
+        name = random_name(rng, professors)
+        if name in professors:
+            continue
+        # Both shapes occur in real data: every day present, or only teaching days
+        all_days = rng.random() < 0.5
+        schedule = {day: [] for day in DAYS_OF_WEEK} if all_days else {}
+        professors[name] = {'name': name, 'current_classes': [], 'schedule': schedule}
+
+        for _ in range(rng.randint(0, 4)):
+            number = f"{rng.choice(['CS', 'ECE', 'MATH', 'PHY'])} F{rng.randint(100, 499)}"
+            section = f"{rng.choice('LTP')}{rng.randint(1, 9)}"
+            code = str(rng.randint(1000, 3000))
+            room = rng.choice(ROOMS)
+            days = sorted(rng.sample(DAYS_OF_WEEK[:6], rng.randint(1, 3)), key=DAYS_OF_WEEK.index)
+            time_slot = random_time(rng)
+            title = f"{rng.choice(['INTRO TO', 'ADVANCED', 'APPLIED'])} {number.split()[0]}"
+
+            for day in days:
+                schedule.setdefault(day, []).append({'time': time_slot, 'course_code': code,
+                                                     'course_title': title, 'section': section, 'room': room})
+            courses.setdefault(f"{code}_{section}", {
+                'course_code': code, 'course_number': number, 'course_title': title, 'section': section,
+                'room': room, 'days': days, 'time_slots': [time_slot] if time_slot else [], 'instructors': [name]
+            })
+
+    return {'professors': professors, 'courses': courses}
+
+def generate_queries(rng, data, count):
+    """(kind, args) queries: name searches and status lookups at random days and times"""
+    names = list(data['professors'])
+    queries = []
+    for _ in range(count):
+        kind = rng.choice(QUERY_KINDS)
+        name = rng.choice(names)
+        if kind == 'search':
+            roll = rng.random()
+            if roll < 0.1:
+                query = ''
+            elif roll < 0.2:
+                query = name.swapcase()
+            elif roll < 0.3:
+                query = 'zzz'
+            else:
+                start = rng.randint(0, len(name) - 1)
+                query = name[start:start + rng.randint(1, 6)]
+            queries.append((kind, (query,)))
+        else:
+            day = rng.choice(DAYS_OF_WEEK)
+            clock = f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+            queries.append((kind, (name, day, clock)))
+    return queries
+
+# --- Engines ---
+
+class BaselineEngine:
+    """Frozen copy of the original lookup functions over plain dicts
+
+    Only the clock is passed in instead of read from datetime.now(); the
+    logic is kept exactly as it was, bugs included.
+    """
+
+    def __init__(self, name, professors):
+        self.name = name
+        self.professors = professors
+
+    def search(self, query):
+        professors = self.professors
+        if not query:
+            return list(professors.keys())[:10]  # Return first 10 if no query
+
+        query = query.lower()
+        matches = []
+
+        for prof_name in professors.keys():
+            prof_lower = prof_name.lower()
+
+            # Exact match
+            if query == prof_lower:
+                matches.insert(0, prof_name)
+            # Starts with query
+            elif prof_lower.startswith(query):
+                matches.append(prof_name)
+            # Contains query
+            elif query in prof_lower:
+                matches.append(prof_name)
+            # Word-wise matching
+            elif any(word.startswith(query) for word in prof_lower.split()):
+                matches.append(prof_name)
+
+        return matches[:10]  # Limit to 10 results
+
+    @staticmethod
+    def _is_time_in_slot(current_time, time_slot):
+        if not time_slot or '-' not in time_slot:
+            return False
+
+        try:
+            start_time, end_time = time_slot.split('-')
+            start_hour, start_min = map(int, start_time.split(':'))
+            end_hour, end_min = map(int, end_time.split(':'))
+
+            current_hour, current_min = map(int, current_time.split(':'))
+
+            start_total_min = start_hour * 60 + start_min
+            end_total_min = end_hour * 60 + end_min
+            current_total_min = current_hour * 60 + current_min
+
+            return start_total_min <= current_total_min <= end_total_min
+        except:
+            return False
+
+    def location(self, prof_name, current_day, current_time):
+        professors = self.professors
+        if prof_name not in professors:
+            return None
+
+        prof_data = professors[prof_name]
+
+        # Check if professor has classes today
+        if current_day not in prof_data['schedule']:
+            return {
+                'status': 'No classes today',
+                'current_class': None,
+                'location': None
+            }
+
+        # Find current class
+        current_class = None
+        for class_info in prof_data['schedule'][current_day]:
+            if self._is_time_in_slot(current_time, class_info['time']):
+                current_class = class_info
+                break
+
+        if current_class:
+            return {
+                'status': 'In class',
+                'current_class': current_class,
+                'location': current_class['room']
+            }
+        else:
+            return {
+                'status': 'Free/Between classes',
+                'current_class': None,
+                'location': 'Not in scheduled class'
+            }
+
+    def upcoming(self, prof_name, current_day, current_time, limit=3):
+        professors = self.professors
+        if prof_name not in professors:
+            return []
+
+        current_hour, current_min = map(int, current_time.split(':'))
+        current_total_min = current_hour * 60 + current_min
+
+        prof_data = professors[prof_name]
+
+        if current_day not in prof_data['schedule']:
+            return []
+
+        upcoming = []
+        for class_info in prof_data['schedule'][current_day]:
+            if not class_info['time'] or '-' not in class_info['time']:
+                continue
+
+            try:
+                start_time = class_info['time'].split('-')[0]
+                start_hour, start_min = map(int, start_time.split(':'))
+                start_total_min = start_hour * 60 + start_min
+
+                if start_total_min > current_total_min:
+                    upcoming.append(class_info)
+            except:
+                continue
+
+        return upcoming[:limit]
+
+class AppEngine:
+    """The app's lookup functions running over a given store"""
+
+    def __init__(self, name, app_module, store):
+        self.name = name
+        self.app = app_module
+        self.store = store
+
+    @contextmanager
+    def _bound(self, day=None, clock=None):
+        """Point the app module at this store and a fixed clock for one call"""
+        saved = (self.app.store, self.app.alias_table, self.app.get_current_day, self.app.get_current_time)
+        self.app.store = self.store
+        # The app's alias table describes the shipped dataset, not the generated one
+        self.app.alias_table = EMPTY_ALIASES
+        if day is not None:
+            self.app.get_current_day = lambda: day
+            self.app.get_current_time = lambda: clock
+        try:
+            yield
+        finally:
+            self.app.store, self.app.alias_table, self.app.get_current_day, self.app.get_current_time = saved
+
+    def search(self, query):
+        with self._bound():
+            return self.app.search_professors(query)
+
+    def location(self, prof_name, day, clock):
+        with self._bound(day, clock):
+            return self.app.get_professor_current_location(prof_name)
+
+    def upcoming(self, prof_name, day, clock):
+        with self._bound(day, clock):
+            return self.app.get_upcoming_classes(prof_name)
+
+class IntervalEngine:
+    """Status lookups on parsed minute intervals, with afternoon times read correctly"""
+
+    def __init__(self, name, store):
+        self.name = name
+        self.store = store
+
+    def search(self, query):
+        return self.store.search_professors(query)
+
+    def location(self, prof_name, day, clock):
+        if not self.store.has_professor(prof_name):
+            return None
+        classes = self.store.get_day_schedule(prof_name, day)
+        if classes is None:
+            return {'status': 'No classes today', 'current_class': None, 'location': None}
+        now = _minutes(clock)
+        for class_info in classes:
+            time_range = parse_time_range(class_info['time'])
+            if time_range and time_range[0] <= now <= time_range[1]:
+                return {'status': 'In class', 'current_class': class_info, 'location': class_info['room']}
+        return {'status': 'Free/Between classes', 'current_class': None, 'location': 'Not in scheduled class'}
+
+    def upcoming(self, prof_name, day, clock, limit=3):
+        if not self.store.has_professor(prof_name):
+            return []
+        now = _minutes(clock)
+        upcoming = []
+        for class_info in self.store.get_day_schedule(prof_name, day) or []:
+            time_range = parse_time_range(class_info['time'])
+            if time_range and time_range[0] > now:
+                upcoming.append(class_info)
+        return upcoming[:limit]
+
+def _minutes(clock):
+    hour, minute = map(int, clock.split(':'))
+    return hour * 60 + minute
+
+def import_app_module(workdir):
+    """Import api/index.py without loading the shipped dataset or writing a cache"""
+    db_path = os.path.join(workdir, 'empty.db')
+    build_database({'professors': {}, 'courses': {}}, db_path)
+    overrides = {'STORAGE_BACKEND': 'sqlite', 'SQLITE_DB_PATH': db_path, 'INDEX_CACHE': '0'}
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        return importlib.import_module('api.index')
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+def build_engines(names, app_module, data, workdir):
+    """Reference engine plus the requested candidates for one timetable"""
+    reference = BaselineEngine('reference', data['professors'])
+    candidates = []
+    for name in names:
+        if name == 'app':
+            candidates.append(AppEngine(name, app_module, DictStore(data)))
+        elif name == 'sqlite':
+            db_path = os.path.join(workdir, 'timetable.db')
+            build_database(data, db_path)
+            candidates.append(AppEngine(name, app_module, SQLiteStore(db_path)))
+        elif name == 'shared':
+            index_path = os.path.join(workdir, 'timetable.idx')
+            build_index(data, index_path)
+            candidates.append(AppEngine(name, app_module, SharedIndexStore(index_path)))
+        elif name == 'interval':
+            candidates.append(IntervalEngine(name, DictStore(data)))
+        else:
+            raise ValueError(f"Unknown engine: {name}")
+    return reference, candidates
+
+# --- Comparison ---
+
+def classify_mismatch(kind, args, expected, actual, data, corrected):
+    """Name of the known bug explaining a mismatch, or None
+
+    corrected is an engine with the afternoon clock fixed; a status answer is
+    only put down to twelve_hour_clock when it equals that engine's answer.
+    """
+    if kind == 'search':
+        exact = [name for name in data['professors'] if name.lower() == args[0].lower()]
+        if len(exact) > 1 and sorted(expected) == sorted(actual):
+            return 'exact_match_order'
+        return None
+
+    if actual == getattr(corrected, kind)(*args):
+        return 'twelve_hour_clock'
+    return None
+
+def run_timetable(reference, candidates, queries, data, report, max_examples):
+    """Answer every query with every engine, recording mismatches and timings"""
+    engines = [reference] + candidates
+    corrected = IntervalEngine('corrected', DictStore(data))
+    answers = {engine.name: [] for engine in engines}
+
+    for engine in engines:
+        timings = report['timings'].setdefault(engine.name, {kind: 0.0 for kind in QUERY_KINDS})
+        for kind, args in queries:
+            method = getattr(engine, kind)
+            start = time.perf_counter()
+            answers[engine.name].append(method(*args))
+            timings[kind] += time.perf_counter() - start
+
+    for candidate in candidates:
+        summary = report['engines'].setdefault(candidate.name, {
+            'queries': 0, 'mismatches': 0, 'known_bugs': {}, 'examples': []
+        })
+        for (kind, args), expected, actual in zip(queries, answers['reference'], answers[candidate.name]):
+            summary['queries'] += 1
+            if expected == actual:
+                continue
+            bug = classify_mismatch(kind, args, expected, actual, data, corrected)
+            if bug:
+                summary['known_bugs'][bug] = summary['known_bugs'].get(bug, 0) + 1
+                continue
+            summary['mismatches'] += 1
+            if len(summary['examples']) < max_examples:
+                summary['examples'].append({'kind': kind, 'args': list(args),
+                                            'expected': expected, 'actual': actual})
+
+def main():
+    """Run the differential test and print a report; exits 1 on unexplained mismatches"""
+    parser = argparse.ArgumentParser(description="Compare lookup engines against the reference implementation")
+    parser.add_argument('--engines', default='app,sqlite,shared,interval',
+                        help="Comma-separated candidates: app, sqlite, shared, interval")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timetables', type=int, default=3, help="Random timetables to generate")
+    parser.add_argument('--professors', type=int, default=200, help="Professors per timetable")
+    parser.add_argument('--queries', type=int, default=2000, help="Queries per timetable")
+    parser.add_argument('--examples', type=int, default=5, help="Mismatch examples kept per engine")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.engines.split(',') if name.strip()]
+    report = {'seed': args.seed, 'known_bug_descriptions': KNOWN_BUGS, 'engines': {}, 'timings': {}}
+
+    with tempfile.TemporaryDirectory() as app_dir:
+        # The app candidates run the current api/index.py lookup functions
+        app_module = import_app_module(app_dir) if {'app', 'sqlite', 'shared'} & set(names) else None
+
+        for i in range(args.timetables):
+            rng = random.Random(args.seed * 1000 + i)
+            data = generate_timetable(rng, args.professors)
+            queries = generate_queries(rng, data, args.queries)
+            with tempfile.TemporaryDirectory() as workdir:
+                reference, candidates = build_engines(names, app_module, data, workdir)
+                run_timetable(reference, candidates, queries, data, report, args.examples)
+
+    reference_total = sum(report['timings']['reference'].values())
+    for name, summary in report['engines'].items():
+        total = sum(report['timings'][name].values())
+        summary['speedup'] = reference_total / total if total else 0.0
+
+    failed = any(summary['mismatches'] for summary in report['engines'].values())
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print(f"{'engine':>10} {'queries':>8} {'mismatch':>9} {'known':>6} {'speedup':>8}")
+        for name, summary in report['engines'].items():
+            known = sum(summary['known_bugs'].values())
+            print(f"{name:>10} {summary['queries']:>8} {summary['mismatches']:>9} {known:>6} "
+                  f"{summary['speedup']:>7.2f}x")
+        for name, summary in report['engines'].items():
+            for bug, count in summary['known_bugs'].items():
+                print(f"  {name}: {count} × known bug {bug}")
+            for example in summary['examples']:
+                print(f"  ❌ {name} {example['kind']}{tuple(example['args'])}: "
+                      f"expected {example['expected']!r}, got {example['actual']!r}")
+        print("\n✅ No unexplained mismatches" if not failed else "\n❌ Unexplained mismatches found")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Instructor name entity resolution
+Merges professor keys that refer to the same person ("Vivek Sharma" and
+"VIVEK SHARMA", "Dr. A Kumar" and "KUMAR A"). Names are grouped into blocks by
+their normalized surname-length tokens and only pairs inside a block are
+scored, so the cost stays far below an all-pairs comparison. Merged variants
+are written to a persisted alias table that the apps' search also uses.
+
+Usage:
+    python entity_resolution.py [structured_data.json] [--aliases aliases.json]
+"""
+
+import argparse
+import json
+import os
+import re
+from collections import defaultdict
+from itertools import combinations
+
+ALIASES_FILE = 'aliases.json'
+
+# Honorifics dropped before comparing names
+TITLES = {'DR', 'PROF', 'MR', 'MRS', 'MS', 'SHRI', 'SMT'}
+
+# Tokens this short are initials; only longer tokens are used as blocking keys
+MIN_BLOCK_TOKEN = 3
+
+# Blocks larger than this (very common surnames) are split no further and skipped
+MAX_BLOCK_SIZE = 100
+
+EXACT_SCORE = 1.0
+INITIALS_SCORE = 0.9
+
+def normalize_name(name):
+    """Uppercase name tokens with punctuation and titles removed"""
+    tokens = re.sub(r'[^A-Za-z0-9]+', ' ', str(name)).upper().split()
+    return [token for token in tokens if token not in TITLES]
+
+def score_pair(tokens_a, tokens_b):
+    """Similarity of two token lists: 1.0 same tokens, 0.9 same up to initials, else 0"""
+    if sorted(tokens_a) == sorted(tokens_b):
+        return EXACT_SCORE
+    if len(tokens_a) != len(tokens_b):
+        return 0.0
+
+    remaining_a = list(tokens_a)
+    remaining_b = list(tokens_b)
+
+    # Full tokens must match one for one
+    for token in [t for t in tokens_a if len(t) > 1]:
+        if token in remaining_b:
+            remaining_a.remove(token)
+            remaining_b.remove(token)
+
+    # What is left must pair an initial with a token starting with that letter
+    if not remaining_a:
+        return 0.0
+    for token in sorted(remaining_a, key=len):
+        match = next((other for other in remaining_b
+                      if (len(token) == 1 or len(other) == 1) and token[0] == other[0]), None)
+        if match is None:
+            return 0.0
+        remaining_b.remove(match)
+    return INITIALS_SCORE
+
+def build_blocks(token_map):
+    """Group names by each token long enough to be a surname"""
+    blocks = defaultdict(set)
+    for name, tokens in token_map.items():
+        for token in tokens:
+            if len(token) >= MIN_BLOCK_TOKEN:
+                blocks[token].add(name)
+    return blocks
+
+class _UnionFind:
+    def __init__(self, items):
+        self.parent = {item: item for item in items}
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+def resolve_names(professors, preferred=()):
+    """Map every non-canonical professor key to its canonical key
+
+    Names in preferred (canonical names from an earlier run) win the choice
+    of canonical name, so it does not flip when class counts change.
+    """
+    token_map = {name: normalize_name(name) for name in professors}
+    blocks = build_blocks(token_map)
+    clusters = _UnionFind(professors)
+
+    initial_edges = []
+    compared = set()
+    for members in blocks.values():
+        if len(members) > MAX_BLOCK_SIZE:
+            continue
+        for a, b in combinations(sorted(members), 2):
+            if (a, b) in compared:
+                continue
+            compared.add((a, b))
+            score = score_pair(token_map[a], token_map[b])
+            if score == EXACT_SCORE:
+                clusters.union(a, b)
+            elif score == INITIALS_SCORE:
+                initial_edges.append((a, b))
+
+    # Initial-only matches merge just when they are unambiguous ("A Kumar" may
+    # match one Anil Kumar but never both Anil Kumar and Arun Kumar)
+    partners = defaultdict(set)
+    for a, b in initial_edges:
+        partners[a].add(clusters.find(b))
+        partners[b].add(clusters.find(a))
+    for a, b in initial_edges:
+        if len(partners[a]) == 1 and len(partners[b]) == 1:
+            clusters.union(a, b)
+
+    groups = defaultdict(list)
+    for name in professors:
+        groups[clusters.find(name)].append(name)
+
+    aliases = {}
+    for names in groups.values():
+        if len(names) < 2:
+            continue
+        canonical = max(names, key=lambda n: (
+            n in preferred,
+            sum(1 for t in token_map[n] if len(t) > 1),
+            sum(len(t) for t in token_map[n]),
+            len(professors[n].get('current_classes', [])),
+            n == n.upper(),
+            n
+        ))
+        for name in names:
+            if name != canonical:
+                aliases[name] = canonical
+    return aliases
+
+def _schedule_key(entry):
+    return (entry.get('time'), entry.get('course_code'), entry.get('section'), entry.get('room'))
+
+def apply_aliases(data, aliases):
+    """Fold aliased professors into their canonical entries, in place"""
+    professors = data.get('professors', {})
+
+    # Sorted so the merged class order does not depend on how the table was built
+    for alias, canonical in sorted(aliases.items()):
+        if alias == canonical or alias not in professors or canonical not in professors:
+            continue
+        source = professors.pop(alias)
+        target = professors[canonical]
+
+        for class_info in source.get('current_classes', []):
+            class_info = dict(class_info)
+            if 'instructor' in class_info:
+                class_info['instructor'] = canonical
+            if class_info not in target['current_classes']:
+                target['current_classes'].append(class_info)
+
+        for day, entries in source.get('schedule', {}).items():
+            day_entries = target['schedule'].setdefault(day, [])
+            seen = {_schedule_key(e) for e in day_entries}
+            for entry in entries:
+                if _schedule_key(entry) not in seen:
+                    seen.add(_schedule_key(entry))
+                    day_entries.append(entry)
+
+    for course in data.get('courses', {}).values():
+        instructors = []
+        for name in course.get('instructors', []):
+            name = aliases.get(name, name)
+            if name not in instructors:
+                instructors.append(name)
+        course['instructors'] = instructors
+
+    return data
+
+def load_aliases(path=ALIASES_FILE):
+    """Read the persisted alias table; empty if it does not exist"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('aliases', {})
+
+def save_aliases(aliases, path=ALIASES_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'aliases': dict(sorted(aliases.items()))}, f, indent=2, ensure_ascii=False)
+
+class AliasTable:
+    """Alias lookups for the apps' professor routes and search"""
+
+    def __init__(self, aliases):
+        self.aliases = aliases
+        # Normalized spelling of every known name, so "dr. vivek sharma" resolves too
+        self._normalized = {}
+        for alias, canonical in sorted(aliases.items()):
+            self._normalized.setdefault(' '.join(normalize_name(canonical)), canonical)
+            self._normalized.setdefault(' '.join(normalize_name(alias)), canonical)
+
+    def canonical(self, name):
+        """Canonical name for a variant, or the name itself if it is not an alias"""
+        return self.aliases.get(name) or self._normalized.get(' '.join(normalize_name(name)), name)
+
+    def expand_search(self, query, results, limit=10):
+        """Append canonical names whose aliases match the query"""
+        query = query.lower()
+        if not query or len(results) >= limit:
+            return results
+        results = list(results)
+        for alias, canonical in self.aliases.items():
+            if query in alias.lower() and canonical not in results:
+                results.append(canonical)
+                if len(results) >= limit:
+                    break
+        return results
+
+def merge_alias_tables(saved, resolved):
+    """Combine a saved alias table with a fresh resolution
+
+    Saved aliases that are now canonical names are dropped, and saved entries
+    pointing at a name that is now an alias follow it to its new canonical.
+    Chains are collapsed and self-mappings removed, so the result never holds
+    a cycle.
+    """
+    canonicals = set(resolved.values())
+    aliases = {alias: canonical for alias, canonical in saved.items()
+               if alias != canonical and alias not in canonicals}
+    aliases.update(resolved)
+
+    # Point chained aliases straight at their final canonical name
+    for alias in list(aliases):
+        target = aliases[alias]
+        seen = {alias}
+        while target in aliases and target not in seen:
+            seen.add(target)
+            target = aliases[target]
+        aliases[alias] = target
+
+    return {alias: canonical for alias, canonical in aliases.items()
+            if alias != canonical and canonical not in aliases}
+
+def resolve_entities(data, alias_path=ALIASES_FILE):
+    """Ingestion stage: merge duplicate professors and persist the alias table"""
+    saved = load_aliases(alias_path)
+    resolved = resolve_names(data.get('professors', {}), preferred=set(saved.values()))
+    aliases = merge_alias_tables(saved, resolved)
+
+    apply_aliases(data, aliases)
+    save_aliases(aliases, alias_path)
+    print(f"Entity resolution: {len(aliases)} aliases, {len(data.get('professors', {}))} professors after merging")
+    return data
+
+def main():
+    """Resolve duplicate professors in an existing structured data file"""
+    parser = argparse.ArgumentParser(description="Merge duplicate instructor names")
+    parser.add_argument('data', nargs='?', default='structured_data.json', help="Structured data JSON file")
+    parser.add_argument('--aliases', default=ALIASES_FILE, help="Alias table to update")
+    parser.add_argument('--dry-run', action='store_true', help="Print the aliases without writing anything")
+    args = parser.parse_args()
+
+    with open(args.data, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if args.dry_run:
+        for alias, canonical in sorted(resolve_names(data.get('professors', {})).items()):
+            print(f"{alias!r} -> {canonical!r}")
+        return
+
+    resolve_entities(data, args.aliases)
+    with open(args.data, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"✅ Updated {args.data} and {args.aliases}")
+
+if __name__ == "__main__":
+    main()
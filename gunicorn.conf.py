@@ -0,0 +1,46 @@
+"""
+Gunicorn settings for running app.py under a pre-fork server
+Before forking, short-lived subprocesses build the shared schedule index and
+its warm-start index cache, so the master never parses structured_data.json.
+Workers map the schedule index read-only instead of each parsing the JSON.
+
+The room index and analytics tensors are not in the shared file: each worker
+unpickles its own copy from the index cache. They are small next to the
+schedule data (one bitset per room and day, one slot count per professor,
+day and slot), but they do add to every worker's RSS.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+import multiprocessing
+import os
+import subprocess
+import sys
+
+import index_cache
+import shared_index
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# Import the app in each worker, not in the master; the master only starts the
+# build subprocesses, so it never holds the parsed JSON
+preload_app = False
+
+DATA_PATH = os.environ.get('DATA_PATH', 'structured_data.json')
+SHARED_INDEX_PATH = os.environ.get('SHARED_INDEX_PATH', 'structured_data.idx')
+
+def on_starting(server):
+    """Build the shared index and its index cache in subprocesses and point workers at them"""
+    index_path = os.path.abspath(SHARED_INDEX_PATH)
+    subprocess.run([sys.executable, shared_index.__file__, DATA_PATH, index_path], check=True)
+    server.log.info(f"Built shared schedule index {index_path}")
+
+    # Workers then load the room index and analytics instead of each rebuilding them
+    if index_cache.cache_writable(index_path):
+        subprocess.run([sys.executable, index_cache.__file__, index_path, '--backend', 'shared'], check=True)
+
+    # Forked workers inherit the master's environment
+    os.environ['STORAGE_BACKEND'] = 'shared'
+    os.environ['SHARED_INDEX_PATH'] = index_path
@@ -0,0 +1,166 @@
+"""
+iCalendar feeds for professor, room and course schedules
+Feeds are weekly recurring events built from the `schedule` data. Each feed is
+rendered once per data version and kept in a bounded LRU, and responses
+carry ETag and Last-Modified so polling calendar clients mostly get a 304.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from flask import Response
+
+from timeslots import parse_time_range
+
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+RRULE_DAYS = {'Monday': 'MO', 'Tuesday': 'TU', 'Wednesday': 'WE', 'Thursday': 'TH',
+              'Friday': 'FR', 'Saturday': 'SA', 'Sunday': 'SU'}
+
+# Calendar clients may re-check no more often than this (seconds)
+FEED_MAX_AGE = 300
+
+# Rendered feeds kept in memory; the least recently used is evicted first
+MAX_CACHED_FEEDS = 512
+
+def professor_events(store, prof_name):
+    """(day, class_info) pairs for a professor, or None if unknown"""
+    if not store.has_professor(prof_name):
+        return None
+    return [(day, class_info) for day in DAYS_OF_WEEK
+            for class_info in store.get_day_schedule(prof_name, day) or []]
+
+def room_events(store, room):
+    """(day, class_info) pairs for a room, or None if the room has no classes"""
+    events = [(day, class_info) for day in DAYS_OF_WEEK for class_info in store.get_room_schedule(room, day)]
+    return events or None
+
+def course_events(store, code):
+    """(day, class_info) pairs for every section of a course, or None if unknown"""
+    events = []
+    for course in store.get_course_sections(code):
+        for day in course['days']:
+            for time_slot in course['time_slots']:
+                events.append((day, {
+                    'time': time_slot,
+                    'course_code': course['course_code'],
+                    'course_title': course['course_title'],
+                    'section': course['section'],
+                    'room': course['room'],
+                    'instructor': ', '.join(course['instructors'])
+                }))
+    return events or None
+
+def _escape(text):
+    return (str(text).replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\n', '\\n'))
+
+def _fold(line):
+    """Fold a content line to 75 octets as RFC 5545 requires"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        # Do not split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    return '\r\n '.join(parts)
+
+def render_calendar(title, events, last_modified):
+    """Render (day, class_info) pairs as a VCALENDAR of weekly recurring events"""
+    stamp = last_modified.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    # Anchor recurrences on the week the data was published
+    week_start = last_modified.date() - timedelta(days=last_modified.weekday())
+
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Professor Locator//Schedule Feed//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_escape(title)}'
+    ]
+
+    for day, class_info in events:
+        time_range = parse_time_range(class_info.get('time'))
+        if day not in RRULE_DAYS or time_range is None:
+            continue
+
+        date = week_start + timedelta(days=DAYS_OF_WEEK.index(day))
+        start = datetime(date.year, date.month, date.day) + timedelta(minutes=time_range[0])
+        end = datetime(date.year, date.month, date.day) + timedelta(minutes=time_range[1])
+        uid_source = f"{title}|{day}|{class_info['time']}|{class_info['course_code']}|{class_info['section']}|{class_info['room']}"
+        summary = f"{class_info['course_title']} ({class_info['section']})"
+        description = class_info.get('instructor') or class_info['course_code']
+
+        lines.extend([
+            'BEGIN:VEVENT',
+            f"UID:{hashlib.sha1(uid_source.encode('utf-8')).hexdigest()}@professor-locator",
+            f'DTSTAMP:{stamp}',
+            f"DTSTART:{start.strftime('%Y%m%dT%H%M%S')}",
+            f"DTEND:{end.strftime('%Y%m%dT%H%M%S')}",
+            f'RRULE:FREQ=WEEKLY;BYDAY={RRULE_DAYS[day]}',
+            f'SUMMARY:{_escape(summary)}',
+            f"LOCATION:{_escape(class_info['room'])}",
+            f'DESCRIPTION:{_escape(description)}',
+            'END:VEVENT'
+        ])
+
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
+
+class FeedCache:
+    """Rendered feeds for one data version, keyed by (kind, key), in a bounded LRU"""
+
+    def __init__(self, data_version, last_modified, registry=None, max_entries=MAX_CACHED_FEEDS):
+        self.data_version = data_version
+        self.last_modified = last_modified
+        self.registry = registry
+        self.max_entries = max_entries
+        self._feeds = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind, key, build_events):
+        """Return (body, etag) for a feed, or None if build_events finds nothing"""
+        cache_key = (kind, key)
+        with self._lock:
+            cached = self._feeds.get(cache_key)
+            if cached is not None:
+                self._feeds.move_to_end(cache_key)
+        if self.registry is not None:
+            self.registry.record_cache('ical', cached is not None)
+        if cached is not None:
+            return cached
+
+        events = build_events()
+        if events is None:
+            return None
+
+        body = render_calendar(f"{key} ({kind})", events, self.last_modified)
+        etag = hashlib.sha1(f"{self.data_version}|{body}".encode('utf-8')).hexdigest()
+        with self._lock:
+            self._feeds[cache_key] = (body, etag)
+            self._feeds.move_to_end(cache_key)
+            while len(self._feeds) > self.max_entries:
+                self._feeds.popitem(last=False)
+        return body, etag
+
+    def response(self, request, kind, key, build_events):
+        """Conditional text/calendar response for a feed, or None if not found"""
+        feed = self.get(kind, key, build_events)
+        if feed is None:
+            return None
+
+        body, etag = feed
+        response = Response(body, mimetype='text/calendar')
+        response.set_etag(etag)
+        response.last_modified = self.last_modified
+        response.cache_control.public = True
+        response.cache_control.max_age = FEED_MAX_AGE
+        return response.make_conditional(request)
@@ -0,0 +1,195 @@
+"""
+Warm-start cache of derived indexes
+A process start normally parses structured_data.json and rebuilds every
+derived index (the in-memory store with its search keys, the room index and
+the analytics tensors). This module pickles those objects to a cache file
+keyed by a SHA-256 of the data file and of the code that builds them, so the
+next start is a single read. When the cache is missing or stale, the app starts
+from the raw data as before and the indexes are rebuilt on a background
+thread, which also rewrites the cache. Where the cache cannot be written
+(read-only serverless deployments) nothing is rebuilt eagerly and the apps
+build each index on first use.
+
+The cache is a pickle written by the app itself; point INDEX_CACHE_PATH only
+at a location other users cannot write to.
+
+Usage (build the cache ahead of time, e.g. before forking workers):
+    python index_cache.py structured_data.idx --backend shared
+
+Environment variables:
+    INDEX_CACHE_PATH    cache file (default: the data file path plus ".cache")
+    INDEX_CACHE         set to 0 to disable loading and writing the cache
+"""
+
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+
+import analytics
+import rooms
+import schedule_store
+import timeslots
+
+# Modules whose classes end up in the cache; editing any of them invalidates it
+CACHED_MODULES = (schedule_store, rooms, analytics, timeslots, sys.modules[__name__])
+
+# Temp files being written; a daemon rebuild thread can be killed mid-write at
+# interpreter exit, so whatever is left is removed by an atexit hook
+_pending_writes = set()
+_pending_lock = threading.Lock()
+_exiting = False
+
+@atexit.register
+def _remove_pending_writes():
+    global _exiting
+    with _pending_lock:
+        _exiting = True
+        for tmp_path in _pending_writes:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        _pending_writes.clear()
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def code_version():
+    """Hash of the source of every module with objects in the cache"""
+    digest = hashlib.sha256()
+    for module in CACHED_MODULES:
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def cache_key(source_path):
+    """Key tying a cache to one data file's contents and the current code"""
+    return f"{_sha256_file(source_path)}-{code_version()}-py{sys.version_info[0]}.{sys.version_info[1]}"
+
+def cache_path_for(source_path, environ=os.environ):
+    return environ.get('INDEX_CACHE_PATH') or source_path + '.cache'
+
+def cache_enabled(environ=os.environ):
+    return environ.get('INDEX_CACHE', '1') != '0'
+
+def cache_writable(source_path, environ=os.environ):
+    """Whether a rebuilt cache could be saved next to where it is configured"""
+    cache_dir = os.path.dirname(os.path.abspath(cache_path_for(source_path, environ)))
+    return cache_enabled(environ) and os.access(cache_dir, os.W_OK)
+
+def load_index_cache(source_path, registry=None, environ=os.environ):
+    """Derived indexes saved for this exact data file and code, or None"""
+    cache_path = cache_path_for(source_path, environ)
+    if not cache_enabled(environ) or not os.path.exists(cache_path) or not os.path.exists(source_path):
+        return None
+
+    try:
+        with open(cache_path, 'rb') as f:
+            # The key is pickled on its own so a stale cache is rejected before the payload is read
+            if pickle.load(f) != cache_key(source_path):
+                hit = False
+                indexes = None
+            else:
+                hit = True
+                indexes = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+        print(f"Ignoring unreadable index cache {cache_path}: {e}")
+        hit = False
+        indexes = None
+
+    if registry is not None:
+        registry.record_cache('index_cache', hit)
+    if indexes is not None and registry is not None and 'analytics' in indexes:
+        indexes['analytics'].registry = registry
+    return indexes
+
+def build_indexes(store):
+    """Build every derived index for a store"""
+    return {
+        'store': store if isinstance(store, schedule_store.DictStore) else None,
+        'rooms': rooms.RoomIndex(store.iter_classes(), store.get_room_table()),
+        'analytics': analytics.UtilizationAnalytics(store.iter_classes())
+    }
+
+def write_index_cache(source_path, indexes, environ=os.environ):
+    """Atomically write indexes to the cache; returns False if the file cannot be written"""
+    cache_path = cache_path_for(source_path, environ)
+    tmp_path = None
+    try:
+        with _pending_lock:
+            if _exiting:
+                return False
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(cache_path) + '.', suffix='.tmp',
+                                            dir=os.path.dirname(os.path.abspath(cache_path)))
+            _pending_writes.add(tmp_path)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(cache_key(source_path), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(indexes, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        return True
+    except OSError as e:
+        # Read-only deployments (e.g. serverless) simply run without a warm cache
+        print(f"Could not write index cache {cache_path}: {e}")
+        return False
+    finally:
+        if tmp_path is not None:
+            with _pending_lock:
+                _pending_writes.discard(tmp_path)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+def rebuild_in_background(source_path, store, on_ready, registry=None, environ=os.environ):
+    """Build indexes on a daemon thread, hand them to on_ready and save the cache"""
+
+    def rebuild():
+        if registry is not None:
+            with registry.timed('index_build_duration_seconds', (('index', 'warm_start'),)):
+                indexes = build_indexes(store)
+        else:
+            indexes = build_indexes(store)
+        if cache_enabled(environ):
+            write_index_cache(source_path, indexes, environ)
+        if registry is not None:
+            indexes['analytics'].registry = registry
+        on_ready(indexes)
+
+    thread = threading.Thread(target=rebuild, name='index-cache-rebuild', daemon=True)
+    thread.start()
+    return thread
+
+def open_store(source_path, backend):
+    """Store for a data file of one storage backend, as the apps open it"""
+    if backend == 'sqlite':
+        from sqlite_backend import SQLiteStore
+        return SQLiteStore(source_path)
+    if backend == 'shared':
+        from shared_index import SharedIndexStore
+        return SharedIndexStore(source_path)
+    with open(source_path, 'r', encoding='utf-8') as f:
+        return schedule_store.DictStore(json.load(f))
+
+def main():
+    """Build the derived indexes for a data file and write its cache"""
+    parser = argparse.ArgumentParser(description="Write the warm-start index cache for a data file")
+    parser.add_argument('source', help="Data file the app loads (JSON, SQLite database or shared index)")
+    parser.add_argument('--backend', choices=('json', 'sqlite', 'shared'), default='json',
+                        help="Storage backend the app uses for this file")
+    args = parser.parse_args()
+
+    indexes = build_indexes(open_store(args.source, args.backend))
+    if not write_index_cache(args.source, indexes):
+        sys.exit(1)
+    print(f"✅ Wrote {cache_path_for(args.source)}")
+
+if __name__ == "__main__":
+    main()
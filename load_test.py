@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Local load-testing harness for the Vercel app (api/index.py)
+Runs the app under a threaded WSGI server that simulates serverless cold starts
+(a fresh import of the app every N requests), replays a mix of search, status
+and detail requests from an asyncio client at increasing concurrency, and
+reports throughput, latency percentiles and cold-start cost.
+
+Usage:
+    python load_test.py --concurrency 1,4,16,64 --requests 500 --cold-start-every 200
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from socketserver import ThreadingMixIn
+from urllib.parse import quote
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Share of each request type in the replayed traffic
+REQUEST_MIX = (('search', 0.5), ('status', 0.35), ('detail', 0.15))
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+class ColdStartApp:
+    """WSGI wrapper that re-imports the app from scratch every `every` requests"""
+
+    def __init__(self, module_name, every):
+        self.module_name = module_name
+        self.every = every
+        self.cold_starts = []
+        self._lock = threading.Lock()
+        self._served = 0
+        self.app = self._import()
+
+    def _import(self):
+        # Drop every project module so the import cost matches a fresh serverless instance
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, '__file__', None) or ''
+            if path.startswith(PROJECT_DIR + os.sep) and name != __name__:
+                del sys.modules[name]
+
+        start = time.perf_counter()
+        app = importlib.import_module(self.module_name).app
+        self.cold_starts.append(time.perf_counter() - start)
+        return app
+
+    def __call__(self, environ, start_response):
+        with self._lock:
+            self._served += 1
+            if self.every and self._served % self.every == 0:
+                self.app = self._import()
+            app = self.app
+        return app(environ, start_response)
+
+def start_server(wsgi_app, port=0):
+    """Serve a WSGI app on a background thread; returns (server, port)"""
+    server = make_server('127.0.0.1', port, wsgi_app,
+                         server_class=ThreadingWSGIServer, handler_class=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+def build_requests(names, count, seed):
+    """A reproducible list of (kind, path) requests following REQUEST_MIX"""
+    rng = random.Random(seed)
+    kinds = [kind for kind, _ in REQUEST_MIX]
+    weights = [weight for _, weight in REQUEST_MIX]
+    requests = []
+
+    for kind in rng.choices(kinds, weights, k=count):
+        name = rng.choice(names)
+        if kind == 'search':
+            path = f"/api/search_professors?q={quote(name[:rng.randint(1, 6)].lower())}"
+        elif kind == 'status':
+            path = f"/api/professor_info/{quote(name)}"
+        else:
+            path = f"/professor/{quote(name)}"
+        requests.append((kind, path))
+
+    return requests
+
+async def fetch(port, path):
+    """Send one HTTP/1.1 GET and return the status code"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode('ascii'))
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+async def run_level(port, requests, concurrency):
+    """Replay requests with `concurrency` concurrent clients; returns per-request results"""
+    queue = asyncio.Queue()
+    for item in requests:
+        queue.put_nowait(item)
+    results = []
+
+    async def client():
+        while not queue.empty():
+            kind, path = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                status = await fetch(port, path)
+            except (OSError, ValueError, IndexError):
+                status = 0
+            results.append((kind, status, time.perf_counter() - start))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return results, time.perf_counter() - start
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def summarize(results, elapsed):
+    """Throughput, latency percentiles (ms) and error count for one level"""
+    latencies = sorted(latency for _, _, latency in results)
+    summary = {
+        'requests': len(results),
+        'errors': sum(1 for _, status, _ in results if status == 0 or status >= 500),
+        'throughput_rps': len(results) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'by_kind': {}
+    }
+    for kind, _ in REQUEST_MIX:
+        kind_latencies = sorted(latency for k, _, latency in results if k == kind)
+        if kind_latencies:
+            summary['by_kind'][kind] = {
+                'requests': len(kind_latencies),
+                'p50_ms': percentile(kind_latencies, 0.50) * 1000,
+                'p99_ms': percentile(kind_latencies, 0.99) * 1000
+            }
+    return summary
+
+def main():
+    """Run the load test and print a report"""
+    parser = argparse.ArgumentParser(description="Load-test the app under a simulated serverless runtime")
+    parser.add_argument('--module', default='api.index', help="Module exposing the Flask `app`")
+    parser.add_argument('--concurrency', default='1,4,16,64', help="Comma-separated concurrency levels")
+    parser.add_argument('--requests', type=int, default=500, help="Requests per concurrency level")
+    parser.add_argument('--cold-start-every', type=int, default=200,
+                        help="Re-import the app every N requests (0 disables cold starts)")
+    parser.add_argument('--keep-rate-limits', action='store_true',
+                        help="Keep the app's per-client rate limits (all load comes from one client)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args()
+
+    with open(os.path.join(PROJECT_DIR, 'structured_data.json'), 'r', encoding='utf-8') as f:
+        names = list(json.load(f).get('professors', {}).keys())
+    if not names:
+        print("ERROR: structured_data.json has no professors to query")
+        sys.exit(1)
+
+    # All simulated traffic comes from one address; lift the per-client limit unless asked not to
+    if not args.keep_rate_limits:
+        os.environ.setdefault('RATE_LIMIT_RPS', '1000000')
+        os.environ.setdefault('RATE_LIMIT_BURST', '1000000')
+
+    wsgi_app = ColdStartApp(args.module, args.cold_start_every)
+    server, port = start_server(wsgi_app)
+
+    report = {'levels': {}}
+    try:
+        for level, concurrency in enumerate(int(c) for c in args.concurrency.split(',')):
+            requests = build_requests(names, args.requests, args.seed + level)
+            results, elapsed = asyncio.run(run_level(port, requests, concurrency))
+            report['levels'][concurrency] = summarize(results, elapsed)
+    finally:
+        server.shutdown()
+
+    cold_starts = sorted(wsgi_app.cold_starts)
+    report['cold_starts'] = {
+        'count': len(cold_starts),
+        'mean_ms': sum(cold_starts) / len(cold_starts) * 1000,
+        'max_ms': cold_starts[-1] * 1000
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'conc':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for concurrency, summary in report['levels'].items():
+        print(f"{concurrency:>5} {summary['throughput_rps']:>9.1f} {summary['p50_ms']:>8.2f} "
+              f"{summary['p95_ms']:>8.2f} {summary['p99_ms']:>8.2f} {summary['errors']:>7}")
+    cold = report['cold_starts']
+    print(f"\nCold starts: {cold['count']} (mean {cold['mean_ms']:.1f} ms, max {cold['max_ms']:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
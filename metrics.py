@@ -0,0 +1,246 @@
+"""
+Built-in instrumentation for the Professor Locator Flask apps
+Records per-route latency histograms, request/error counts, data load and
+index build durations and cache hit ratios, and exposes them at /metrics
+(Prometheus text format) and /metrics.json
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, jsonify, request
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HELP_TEXT = {
+    'http_requests_total': 'Requests handled, by route, method and status code',
+    'http_request_errors_total': 'Requests that ended in a 5xx response or an unhandled exception',
+    'http_request_duration_seconds': 'Request latency by route',
+    'data_load_duration_seconds': 'Time spent loading structured_data.json',
+    'index_build_duration_seconds': 'Time spent building derived lookup indexes',
+    'cache_requests_total': 'Cache lookups by cache name and result',
+    'admission_decisions_total': 'Admission control outcomes (admitted, rate_limited, overloaded)'
+}
+
+class _Shard:
+    """Per-thread counters; only the owning thread writes to it"""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+    def merge_into(self, counters, histograms):
+        for key, value in self.counters.copy().items():
+            counters[key] = counters.get(key, 0) + value
+        for key, hist in self.histograms.copy().items():
+            merged = histograms.get(key)
+            if merged is None:
+                histograms[key] = list(hist)
+            else:
+                for i, value in enumerate(hist):
+                    merged[i] += value
+
+class MetricsRegistry:
+    """Thread-sharded metrics store
+
+    Each thread updates its own shard without locking. The lock is only taken
+    when a thread registers its shard and when metrics are collected, at which
+    point shards of finished threads are folded into a retired total.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+        self._retired = _Shard()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _Shard()
+            self._local.shard = shard
+            with self._lock:
+                self._retire_dead_threads()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_dead_threads(self):
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                shard.merge_into(self._retired.counters, self._retired.histograms)
+        self._shards = live
+
+    def inc(self, name, labels=(), value=1):
+        """Increment a counter"""
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        """Record one observation in a histogram"""
+        histograms = self._shard().histograms
+        key = (name, labels)
+        hist = histograms.get(key)
+        if hist is None:
+            # One slot per bucket, then +Inf, sum and count
+            hist = histograms[key] = [0] * (len(self.buckets) + 3)
+        hist[bisect.bisect_left(self.buckets, value)] += 1
+        hist[-2] += value
+        hist[-1] += 1
+
+    @contextmanager
+    def timed(self, name, labels=()):
+        """Context manager recording the duration of the block in a histogram"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def record_cache(self, cache, hit):
+        """Count a cache hit or miss"""
+        self.inc('cache_requests_total', (('cache', cache), ('result', 'hit' if hit else 'miss')))
+
+    def collect(self):
+        """Merge all shards into (counters, histograms) snapshots"""
+        counters = {}
+        histograms = {}
+        with self._lock:
+            self._retire_dead_threads()
+            self._retired.merge_into(counters, histograms)
+            for _, shard in self._shards:
+                shard.merge_into(counters, histograms)
+        return counters, histograms
+
+    def to_prometheus(self):
+        """Render metrics in the Prometheus text exposition format"""
+        counters, histograms = self.collect()
+        lines = []
+
+        for name in sorted({key[0] for key in counters}):
+            lines.append(f"# HELP {name} {HELP_TEXT.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        for name in sorted({key[0] for key in histograms}):
+            lines.append(f"# HELP {name} {HELP_TEXT.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, labels), hist in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',), hist):
+                    cumulative += count
+                    le = bound if bound == '+Inf' else repr(float(bound))
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {hist[-2]}")
+                lines.append(f"{name}_count{_format_labels(labels)} {hist[-1]}")
+
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self):
+        """Summarise metrics as plain JSON-serialisable data"""
+        counters, histograms = self.collect()
+        routes = {}
+        caches = {}
+        durations = {}
+
+        for (name, labels), value in counters.items():
+            label_map = dict(labels)
+            if name == 'http_requests_total':
+                route = routes.setdefault(label_map['route'], {'requests': 0, 'errors': 0})
+                route['requests'] += value
+            elif name == 'http_request_errors_total':
+                route = routes.setdefault(label_map['route'], {'requests': 0, 'errors': 0})
+                route['errors'] += value
+            elif name == 'cache_requests_total':
+                cache = caches.setdefault(label_map['cache'], {'hit': 0, 'miss': 0})
+                cache[label_map['result']] += value
+
+        for (name, labels), hist in histograms.items():
+            label_map = dict(labels)
+            summary = {
+                'count': hist[-1],
+                'sum_seconds': hist[-2],
+                'mean_seconds': hist[-2] / hist[-1] if hist[-1] else 0.0,
+                'buckets': {str(bound): count for bound, count in zip(self.buckets + ('+Inf',), hist)}
+            }
+            if name == 'http_request_duration_seconds':
+                routes.setdefault(label_map['route'], {'requests': 0, 'errors': 0})['latency'] = summary
+            else:
+                key = name if not label_map else f"{name}{_format_labels(labels)}"
+                durations[key] = summary
+
+        for route in routes.values():
+            route['error_rate'] = route['errors'] / route['requests'] if route['requests'] else 0.0
+        for cache in caches.values():
+            total = cache['hit'] + cache['miss']
+            cache['hit_ratio'] = cache['hit'] / total if total else 0.0
+
+        return {'routes': routes, 'caches': caches, 'durations': durations}
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+# Process-wide registry shared by the app and helper modules
+REGISTRY = MetricsRegistry()
+
+def install_metrics(app, registry=REGISTRY):
+    """Attach the request timing middleware and the /metrics endpoints to a Flask app"""
+
+    def route_label():
+        # Use the URL rule, not the raw path, so label cardinality stays bounded
+        return request.url_rule.rule if request.url_rule else 'unmatched'
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = g.pop('metrics_start', None)
+        if start is not None:
+            route = route_label()
+            registry.observe('http_request_duration_seconds', time.perf_counter() - start, (('route', route),))
+            registry.inc('http_requests_total',
+                         (('route', route), ('method', request.method), ('status', str(response.status_code))))
+            if response.status_code >= 500:
+                registry.inc('http_request_errors_total', (('route', route),))
+        return response
+
+    @app.teardown_request
+    def record_request_exception(exc):
+        # after_request is skipped when a view raises, so count those here
+        start = g.pop('metrics_start', None)
+        if start is not None and exc is not None:
+            route = route_label()
+            registry.observe('http_request_duration_seconds', time.perf_counter() - start, (('route', route),))
+            registry.inc('http_requests_total', (('route', route), ('method', request.method), ('status', '500')))
+            registry.inc('http_request_errors_total', (('route', route),))
+
+    @app.route('/metrics')
+    def metrics_prometheus():
+        """Metrics in Prometheus text format"""
+        return registry.to_prometheus(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+    @app.route('/metrics.json')
+    def metrics_json():
+        """Metrics summary as JSON"""
+        return jsonify(registry.to_dict())
+
+    return registry
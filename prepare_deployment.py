@@ -4,10 +4,115 @@ Deployment preparation script for Vercel
 This script ensures the structured_data.json is available and optimized for deployment
 """
 
+import hashlib
 import json
 import os
 import sys
 
+from compression import available_encodings, precompress_file, remove_stale_variants
+from rooms import add_room_table
+
+# Versioned dataset published for the browser client's delta sync
+DATA_DIR = 'data'
+MANIFEST_PATH = os.path.join(DATA_DIR, 'manifest.json')
+MAX_VERSIONS = 10
+
+# Static files served with precompressed .br/.gz variants; pages rendered by
+# the app (such as /) are compressed by its response hook instead
+PRECOMPRESSED_FILES = ['structured_data.json']
+
+def dataset_version(dataset):
+    """Content hash identifying one version of the dataset"""
+    canonical = json.dumps(dataset, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+def compute_delta(old, new, from_version, to_version):
+    """Changes that turn dataset `old` into dataset `new`"""
+    delta = {'from': from_version, 'to': to_version}
+    
+    for section in ('professors', 'courses'):
+        old_items = old.get(section, {})
+        new_items = new.get(section, {})
+        entry = {
+            'upsert': {key: value for key, value in new_items.items() if old_items.get(key) != value},
+            'remove': [key for key in old_items if key not in new_items]
+        }
+        
+        # Clients append new keys at the end; send the full key order only when that is not enough
+        applied_order = [key for key in old_items if key in new_items] + \
+                        [key for key in new_items if key not in old_items]
+        if applied_order != list(new_items):
+            entry['order'] = list(new_items)
+        
+        delta[section] = entry
+    
+    return delta
+
+def write_compact_json(path, obj):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, separators=(',', ':'), ensure_ascii=False)
+
+def publish_data_versions(dataset):
+    """Publish a snapshot, a delta from the previous version and the manifest"""
+    os.makedirs(os.path.join(DATA_DIR, 'versions'), exist_ok=True)
+    os.makedirs(os.path.join(DATA_DIR, 'deltas'), exist_ok=True)
+    
+    manifest = {'current': None, 'versions': [], 'deltas': {}}
+    if os.path.exists(MANIFEST_PATH):
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    
+    version = dataset_version(dataset)
+    if manifest.get('current') == version:
+        print(f"✅ Published data already at version {version}")
+        return manifest
+    
+    previous = manifest.get('current')
+    snapshot_path = f"{DATA_DIR}/versions/{version}.json"
+    write_compact_json(snapshot_path, dataset)
+    
+    previous_path = f"{DATA_DIR}/versions/{previous}.json"
+    if previous and os.path.exists(previous_path):
+        with open(previous_path, 'r', encoding='utf-8') as f:
+            previous_dataset = json.load(f)
+        delta_path = f"{DATA_DIR}/deltas/{previous}_{version}.json"
+        write_compact_json(delta_path, compute_delta(previous_dataset, dataset, previous, version))
+        manifest['deltas'][previous] = delta_path
+    else:
+        # Without the previous snapshot there is nothing to diff against; restart the chain
+        manifest['versions'] = []
+        manifest['deltas'] = {}
+    
+    manifest['versions'] = (manifest['versions'] + [version])[-MAX_VERSIONS:]
+    manifest['current'] = version
+    manifest['snapshot'] = snapshot_path
+    
+    # Keep deltas for the retained versions and only the current snapshot
+    for from_version, delta_path in list(manifest['deltas'].items()):
+        if from_version not in manifest['versions']:
+            del manifest['deltas'][from_version]
+            if os.path.exists(delta_path):
+                os.remove(delta_path)
+    for name in os.listdir(os.path.join(DATA_DIR, 'versions')):
+        if name != f"{version}.json":
+            os.remove(os.path.join(DATA_DIR, 'versions', name))
+    
+    write_compact_json(MANIFEST_PATH, manifest)
+    print(f"✅ Published data version {version} ({len(manifest['deltas'])} deltas available)")
+    return manifest
+
+def precompress_assets():
+    """Write .br/.gz variants of the static assets and every published data file"""
+    paths = [path for path in PRECOMPRESSED_FILES if os.path.exists(path)]
+    for root, _, files in os.walk(DATA_DIR):
+        paths.extend(os.path.join(root, name) for name in sorted(files) if name.endswith('.json'))
+    
+    remove_stale_variants(DATA_DIR)
+    for path in paths:
+        precompress_file(path)
+    
+    print(f"✅ Precompressed {len(paths)} files ({', '.join(available_encodings())})")
+
 def prepare_for_deployment():
     """Prepare the application for Vercel deployment"""
     
@@ -24,6 +129,8 @@ def prepare_for_deployment():
         
         professors = data.get('professors', {})
         courses = data.get('courses', {})
+        # Room hierarchy from ingestion; older data files get it built here
+        rooms = data['rooms'] if 'rooms' in data else add_room_table(data)['rooms']
         
         print(f"✅ Data file loaded successfully!")
         print(f"📊 Found {len(professors)} professors and {len(courses)} courses")
@@ -36,6 +143,7 @@ def prepare_for_deployment():
     optimized_data = {
         'professors': professors,
         'courses': courses,
+        'rooms': rooms,
         'last_updated': data.get('last_updated', ''),
         'deployment_ready': True
     }
@@ -46,6 +154,12 @@ def prepare_for_deployment():
     
     print("✅ Data optimized for deployment")
     
+    # Publish versioned snapshot and deltas for the static site
+    publish_data_versions({'professors': professors, 'courses': courses})
+    
+    # Precompressed variants for Accept-Encoding negotiation
+    precompress_assets()
+    
     # Check required files
     required_files = [
         'vercel.json',
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+On-demand request profiling for the Professor Locator Flask apps
+Profiling is off unless PROFILING_ENABLED=1 and PROFILING_SECRET are set, and
+then only runs for requests carrying a valid signature header. Output is a
+pstats file (cProfile mode) or a collapsed-stack file ready for flamegraph
+tools (sample mode), written to PROFILING_DIR.
+
+Environment variables:
+    PROFILING_ENABLED          "1" to allow profiling
+    PROFILING_SECRET           shared secret used to sign profiling requests
+    PROFILING_DIR              output directory (default: profiles)
+    PROFILING_MODE             "cprofile" (default) or "sample"
+    PROFILING_MAX_PER_MINUTE   profiled requests allowed per minute (default: 6)
+    PROFILING_SAMPLE_INTERVAL  sampling interval in milliseconds (default: 1)
+"""
+
+import argparse
+import cProfile
+import collections
+import hashlib
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+
+from flask import g, request
+
+SIGNATURE_HEADER = 'X-Profile-Signature'
+TIMESTAMP_HEADER = 'X-Profile-Timestamp'
+
+# Signed requests older than this are rejected so captured headers cannot be replayed later
+MAX_CLOCK_SKEW = 300
+
+def sign_request(secret, method, path, timestamp=None):
+    """Return (timestamp, signature) headers for a profiling request"""
+    timestamp = str(int(time.time()) if timestamp is None else int(timestamp))
+    message = f"{timestamp}:{method.upper()}:{path}".encode('utf-8')
+    signature = hmac.new(secret.encode('utf-8'), message, hashlib.sha256).hexdigest()
+    return timestamp, signature
+
+def verify_request(secret, method, path, timestamp, signature, now=None):
+    """Check a profiling signature and its freshness"""
+    if not timestamp or not signature:
+        return False
+    try:
+        age = abs((time.time() if now is None else now) - int(timestamp))
+    except ValueError:
+        return False
+    if age > MAX_CLOCK_SKEW:
+        return False
+    _, expected = sign_request(secret, method, path, timestamp)
+    return hmac.compare_digest(expected, signature)
+
+class RateLimiter:
+    """Allow at most `limit` events per sliding 60 second window"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._events = collections.deque()
+        self._lock = threading.Lock()
+
+    def allow(self):
+        now = time.monotonic()
+        with self._lock:
+            while self._events and now - self._events[0] > 60:
+                self._events.popleft()
+            if len(self._events) >= self.limit:
+                return False
+            self._events.append(now)
+            return True
+
+class StackSampler:
+    """Sample one thread's Python stack on a background thread"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+def _output_name(directory, route):
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'
+    return os.path.join(directory, f"{int(time.time() * 1000)}-{slug}-{uuid.uuid4().hex[:8]}")
+
+def install_profiling(app, environ=os.environ):
+    """Attach the opt-in profiling hooks to a Flask app; a no-op unless enabled"""
+    secret = environ.get('PROFILING_SECRET', '')
+    if environ.get('PROFILING_ENABLED') != '1' or not secret:
+        return None
+
+    directory = environ.get('PROFILING_DIR', 'profiles')
+    mode = environ.get('PROFILING_MODE', 'cprofile')
+    interval = float(environ.get('PROFILING_SAMPLE_INTERVAL', '1')) / 1000.0
+    limiter = RateLimiter(int(environ.get('PROFILING_MAX_PER_MINUTE', '6')))
+    os.makedirs(directory, exist_ok=True)
+
+    @app.before_request
+    def start_profiling():
+        if SIGNATURE_HEADER not in request.headers:
+            return
+        if not verify_request(secret, request.method, request.path,
+                              request.headers.get(TIMESTAMP_HEADER), request.headers.get(SIGNATURE_HEADER)):
+            return
+        if not limiter.allow():
+            return
+
+        if mode == 'sample':
+            profiler = StackSampler(threading.get_ident(), interval)
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        g.profiler = profiler
+
+    def finish_profiling():
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return None
+
+        route = request.url_rule.rule if request.url_rule else request.path
+        base = _output_name(directory, route)
+        if isinstance(profiler, StackSampler):
+            profiler.stop()
+            path = base + '.collapsed'
+            profiler.write(path)
+        else:
+            profiler.disable()
+            path = base + '.pstats'
+            profiler.dump_stats(path)
+        return path
+
+    @app.after_request
+    def stop_profiling(response):
+        path = finish_profiling()
+        if path:
+            response.headers['X-Profile-Output'] = os.path.basename(path)
+        return response
+
+    @app.teardown_request
+    def stop_profiling_on_error(exc):
+        finish_profiling()
+
+    return directory
+
+def main():
+    """Print the headers needed to profile one request"""
+    parser = argparse.ArgumentParser(description="Sign a request for on-demand profiling")
+    parser.add_argument('path', help="Unencoded request path, e.g. \"/api/professor_info/JAYAPRAKASH K S\"")
+    parser.add_argument('--method', default='GET')
+    args = parser.parse_args()
+
+    secret = os.environ.get('PROFILING_SECRET')
+    if not secret:
+        print("ERROR: PROFILING_SECRET is not set")
+        sys.exit(1)
+
+    timestamp, signature = sign_request(secret, args.method, args.path)
+    print(f"{TIMESTAMP_HEADER}: {timestamp}")
+    print(f"{SIGNATURE_HEADER}: {signature}")
+
+if __name__ == "__main__":
+    main()
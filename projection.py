@@ -0,0 +1,73 @@
+"""
+Field projection and compact encoding for API responses
+`fields=` selects which top-level fields are computed at all, and `compact=1`
+replaces each class entry with indexes into a shared string table. When
+all_classes_today is included, upcoming_classes becomes a list of row indexes
+into it, since every upcoming class is also one of today's classes.
+"""
+
+# Keys of a class entry, in the order used by compact rows
+CLASS_COLUMNS = ('time', 'course_code', 'course_title', 'section', 'room')
+
+def parse_fields(param, allowed):
+    """Turn a comma-separated fields parameter into a list of allowed fields
+
+    An empty parameter selects every field. Raises ValueError on unknown names.
+    """
+    if not param:
+        return list(allowed)
+
+    requested = {field.strip() for field in param.split(',') if field.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [field for field in allowed if field in requested]
+
+class StringTable:
+    """Assign each distinct string one index"""
+
+    def __init__(self):
+        self.strings = []
+        self._index = {}
+
+    def ref(self, value):
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def row(self, class_info):
+        return [self.ref(class_info.get(column, '')) for column in CLASS_COLUMNS]
+
+def compact_payload(payload):
+    """Rewrite class entries in a professor_info payload as string-table rows"""
+    table = StringTable()
+    compact = dict(payload)
+    has_classes = False
+
+    if 'all_classes_today' in compact:
+        has_classes = True
+        compact['all_classes_today'] = [table.row(class_info) for class_info in compact['all_classes_today']]
+
+    if 'upcoming_classes' in compact:
+        has_classes = True
+        upcoming = [table.row(class_info) for class_info in compact['upcoming_classes']]
+        if 'all_classes_today' in compact:
+            positions = {}
+            for position, row in enumerate(compact['all_classes_today']):
+                positions.setdefault(tuple(row), position)
+            # Rows only if the day changed between building the two fields
+            if all(tuple(row) in positions for row in upcoming):
+                upcoming = [positions[tuple(row)] for row in upcoming]
+        compact['upcoming_classes'] = upcoming
+
+    status = compact.get('current_status')
+    if status and status.get('current_class'):
+        has_classes = True
+        compact['current_status'] = dict(status, current_class=table.row(status['current_class']))
+
+    if has_classes:
+        compact['columns'] = list(CLASS_COLUMNS)
+        compact['strings'] = table.strings
+    return compact
@@ -0,0 +1,110 @@
+"""
+Room hierarchy and free-room search
+Room codes encode their location: "F201" is building F, floor 2, room 01, and
+"D208 B" is part B of D208. RoomIndex keeps the rooms grouped by building and
+floor together with one occupancy bitset per room and day (bit n set when
+teaching slot n is taken), so a free-room query is a few bit tests per room
+instead of a scan over every professor's schedule.
+"""
+
+import re
+
+from analytics import N_SLOTS, FIRST_SLOT_MINUTE, slots_for
+
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+ROOM_PATTERN = re.compile(r'^([A-Z])(\d)(\d{2})\s*([A-Z]?)$')
+
+# Extra cost of leaving one building for another, in floors climbed
+BUILDING_CHANGE_COST = 2
+
+def parse_room(code):
+    """Split a room code into building, floor and number, or None if it has no location"""
+    match = ROOM_PATTERN.match((code or '').strip().upper())
+    if not match:
+        return None
+    building, floor, number, part = match.groups()
+    return {'building': building, 'floor': int(floor), 'number': int(number), 'part': part}
+
+def room_table(rooms):
+    """Parsed location of every locatable room code, keyed by code"""
+    table = {}
+    for code in sorted(set(rooms)):
+        location = parse_room(code)
+        if location is not None:
+            table[code] = location
+    return table
+
+def add_room_table(data):
+    """Ingestion stage: store the parsed room hierarchy under data['rooms']"""
+    rooms = (class_info.get('room')
+             for prof_data in data.get('professors', {}).values()
+             for entries in prof_data.get('schedule', {}).values()
+             for class_info in entries)
+    data['rooms'] = room_table(room for room in rooms if room)
+    return data
+
+def room_distance(origin, location):
+    """Walking distance in floors between two parsed rooms, plus a room-number tiebreak"""
+    if origin['building'] == location['building']:
+        floors = abs(origin['floor'] - location['floor'])
+    else:
+        # Down to the ground floor, across, and back up
+        floors = origin['floor'] + BUILDING_CHANGE_COST + location['floor']
+    return floors, abs(origin['number'] - location['number'])
+
+def slot_for_minute(minute):
+    """Teaching slot containing a minute of the day, or None outside teaching hours"""
+    slot = (minute - FIRST_SLOT_MINUTE) // 60
+    return slot if 0 <= slot < N_SLOTS else None
+
+class RoomIndex:
+    """Room hierarchy plus per-room, per-day occupancy bitsets"""
+
+    def __init__(self, classes, table=None):
+        """Build from (instructor, day, class_info) triples; table is an ingested room table"""
+        self.occupancy = {}
+        for _, day, class_info in classes:
+            room = class_info.get('room')
+            if not room or day not in DAYS_OF_WEEK:
+                continue
+            masks = self.occupancy.setdefault(room, [0] * len(DAYS_OF_WEEK))
+            for slot in slots_for(class_info.get('time')):
+                masks[DAYS_OF_WEEK.index(day)] |= 1 << slot
+
+        self.locations = dict(table) if table else room_table(self.occupancy)
+        self.buildings = {}
+        for code, location in self.locations.items():
+            floors = self.buildings.setdefault(location['building'], {})
+            floors.setdefault(location['floor'], []).append(code)
+
+    def is_free(self, room, day, slot):
+        """Whether a room has no class in a slot"""
+        masks = self.occupancy.get(room)
+        return masks is None or not masks[DAYS_OF_WEEK.index(day)] & (1 << slot)
+
+    def nearest_free(self, origin_code, day, minute, limit=5):
+        """Closest rooms with no class at a minute of a day, nearest first
+
+        Raises ValueError if the origin code or day cannot be used.
+        """
+        origin = parse_room(origin_code)
+        if origin is None:
+            raise ValueError(f"Unrecognised room code: {origin_code}")
+        if day not in DAYS_OF_WEEK:
+            raise ValueError(f"Unknown day: {day}")
+
+        slot = slot_for_minute(minute)
+        results = []
+        for building, floors_in_building in self.buildings.items():
+            for codes in floors_in_building.values():
+                for code in codes:
+                    if slot is not None and not self.is_free(code, day, slot):
+                        continue
+                    floors, offset = room_distance(origin, self.locations[code])
+                    results.append((floors, building != origin['building'], offset, code))
+
+        results.sort()
+        return [{'room': code, **self.locations[code], 'floors_away': floors,
+                 'same_building': not other_building}
+                for floors, other_building, offset, code in results[:limit]]
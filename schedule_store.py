@@ -0,0 +1,91 @@
+"""
+In-memory schedule store over the structured_data.json dictionaries
+This is the default storage backend for the Flask apps; sqlite_backend.SQLiteStore
+answers the same queries from an indexed SQLite database.
+"""
+
+class DictStore:
+    """Answer schedule queries with loops over the nested professor/course dicts"""
+
+    def __init__(self, data):
+        self.professors = data.get('professors', {})
+        self.courses = data.get('courses', {})
+        self.rooms = data.get('rooms')
+        # Lowercased names, computed once instead of on every search
+        self.name_index = [(name, name.lower()) for name in self.professors]
+
+    def has_professor(self, prof_name):
+        """Check whether a professor exists"""
+        return prof_name in self.professors
+
+    def get_day_schedule(self, prof_name, day):
+        """Get a professor's classes for one day, or None if the day is not in their schedule"""
+        return self.professors[prof_name]['schedule'].get(day)
+
+    def get_room_table(self):
+        """Room hierarchy written at ingestion, or None if the data predates it"""
+        return self.rooms
+
+    def iter_classes(self):
+        """Yield (professor, day, class_info) for every scheduled class"""
+        for prof_name, prof_data in self.professors.items():
+            for day, entries in prof_data['schedule'].items():
+                for class_info in entries:
+                    yield prof_name, day, class_info
+
+    def search_professors(self, query):
+        """Search professors by name with fuzzy matching"""
+        if not query:
+            return list(self.professors.keys())[:10]  # Return first 10 if no query
+
+        query = query.lower()
+        matches = []
+
+        for prof_name, prof_lower in self.name_index:
+            # Exact match
+            if query == prof_lower:
+                matches.insert(0, prof_name)
+            # Starts with query
+            elif prof_lower.startswith(query):
+                matches.append(prof_name)
+            # Contains query
+            elif query in prof_lower:
+                matches.append(prof_name)
+            # Word-wise matching
+            elif any(word.startswith(query) for word in prof_lower.split()):
+                matches.append(prof_name)
+
+        return matches[:10]  # Limit to 10 results
+
+    def search_courses(self, query, limit=10):
+        """Search courses by number or title, one result per course"""
+        query = query.lower()
+        results = []
+        seen = set()
+
+        for course in self.courses.values():
+            key = (course['course_number'], course['course_title'])
+            if key in seen:
+                continue
+            if query in f"{key[0]} {key[1]}".lower():
+                seen.add(key)
+                results.append({'course_number': key[0], 'course_title': key[1]})
+                if len(results) >= limit:
+                    break
+
+        return results
+
+    def get_room_schedule(self, room, day):
+        """Get every class held in a room on one day"""
+        entries = []
+        for prof_name, prof_data in self.professors.items():
+            for class_info in prof_data['schedule'].get(day) or []:
+                if class_info['room'] == room:
+                    entries.append(dict(class_info, instructor=prof_name))
+        return entries
+
+    def get_course_sections(self, code):
+        """Get all sections of a course by comp code or course number"""
+        code = code.strip().upper()
+        return [course for course in self.courses.values()
+                if course['course_code'] == code or course['course_number'].upper() == code]
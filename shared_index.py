@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Shared, memory-mapped schedule index for pre-fork servers
+The master process builds a compact binary index from structured_data.json
+once; every worker maps the file read-only and reads it through zero-copy
+memoryviews, so the page cache holds a single copy no matter how many workers
+run. SharedIndexStore answers the same queries as schedule_store.DictStore.
+
+File layout (little-endian uint32 unless noted):
+    header       MAGIC, then one count or offset per name in HEADER_FIELDS
+    str_offsets  n_strings + 1 offsets into str_blob
+    str_blob     UTF-8 bytes of every distinct string
+    prof_names   string id of each professor name, in data order
+    prof_lower   string id of each lowercased name
+    prof_sorted  professor indexes sorted by name bytes (for binary search)
+    day_starts   n_profs * 7 + 1 offsets into entries, one per (professor, day)
+    day_present  uint8 per professor, bit d set when day d is in the schedule
+    entries      5 string ids per class: time, course_code, course_title, section, room
+    course_rows  4 string ids per section: course_code, upper course number,
+                 lowercased "number title" search text, section JSON
+
+Usage:
+    python shared_index.py [structured_data.json] [structured_data.idx]
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b'WHRIDX01'
+HEADER_FIELDS = ('n_strings', 'n_profs', 'n_entries', 'n_courses',
+                 'str_offsets', 'str_blob', 'prof_names', 'prof_lower', 'prof_sorted',
+                 'day_starts', 'day_present', 'entries', 'course_rows')
+HEADER_SIZE = len(MAGIC) + 4 * len(HEADER_FIELDS)
+
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+ENTRY_COLUMNS = ('time', 'course_code', 'course_title', 'section', 'room')
+ENTRY_WIDTH = len(ENTRY_COLUMNS)
+COURSE_WIDTH = 4
+
+def _u32(values):
+    return struct.pack(f'<{len(values)}I', *values)
+
+def build_index(data, index_path):
+    """Write the binary index for processor output to index_path"""
+    strings = []
+    string_ids = {}
+
+    def sid(value):
+        value = value or ''
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    professors = data.get('professors', {})
+    names = list(professors.keys())
+    prof_names = [sid(name) for name in names]
+    prof_lower = [sid(name.lower()) for name in names]
+    prof_sorted = sorted(range(len(names)), key=lambda i: names[i].encode('utf-8'))
+
+    day_starts = []
+    day_present = bytearray()
+    entries = []
+    for name in names:
+        schedule = professors[name].get('schedule', {})
+        present = 0
+        for bit, day in enumerate(DAYS_OF_WEEK):
+            day_starts.append(len(entries) // ENTRY_WIDTH)
+            if day in schedule:
+                present |= 1 << bit
+                for class_info in schedule[day]:
+                    entries.extend(sid(class_info.get(column)) for column in ENTRY_COLUMNS)
+        day_present.append(present)
+    day_starts.append(len(entries) // ENTRY_WIDTH)
+
+    course_rows = []
+    for course in data.get('courses', {}).values():
+        course_rows.extend([
+            sid(course['course_code']),
+            sid(course['course_number'].upper()),
+            sid(f"{course['course_number']} {course['course_title']}".lower()),
+            sid(json.dumps(course, ensure_ascii=False))
+        ])
+
+    encoded = [s.encode('utf-8') for s in strings]
+    str_offsets = [0]
+    for blob in encoded:
+        str_offsets.append(str_offsets[-1] + len(blob))
+
+    sections = [
+        ('str_offsets', _u32(str_offsets)),
+        ('str_blob', b''.join(encoded)),
+        ('prof_names', _u32(prof_names)),
+        ('prof_lower', _u32(prof_lower)),
+        ('prof_sorted', _u32(prof_sorted)),
+        ('day_starts', _u32(day_starts)),
+        ('day_present', bytes(day_present)),
+        ('entries', _u32(entries)),
+        ('course_rows', _u32(course_rows))
+    ]
+
+    header = {'n_strings': len(strings), 'n_profs': len(names),
+              'n_entries': len(entries) // ENTRY_WIDTH, 'n_courses': len(course_rows) // COURSE_WIDTH}
+    body = bytearray()
+    for field, blob in sections:
+        # Keep uint32 arrays 4-byte aligned so memoryview.cast works
+        body.extend(b'\0' * (-(HEADER_SIZE + len(body)) % 4))
+        header[field] = HEADER_SIZE + len(body)
+        body.extend(blob)
+
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_u32([header[field] for field in HEADER_FIELDS]))
+        f.write(body)
+    os.replace(tmp_path, index_path)
+
+class SharedIndexStore:
+    """Read-only view of a memory-mapped index built by build_index"""
+
+    def __init__(self, index_path):
+        with open(index_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{index_path} is not a schedule index")
+
+        header = dict(zip(HEADER_FIELDS, struct.unpack_from(f'<{len(HEADER_FIELDS)}I', view, len(MAGIC))))
+        self.n_profs = header['n_profs']
+        self.n_courses = header['n_courses']
+
+        def u32(field, count):
+            start = header[field]
+            return view[start:start + 4 * count].cast('I')
+
+        self._str_offsets = u32('str_offsets', header['n_strings'] + 1)
+        blob_start = header['str_blob']
+        self._str_blob = view[blob_start:blob_start + self._str_offsets[-1]]
+        self._prof_names = u32('prof_names', self.n_profs)
+        self._prof_lower = u32('prof_lower', self.n_profs)
+        self._prof_sorted = u32('prof_sorted', self.n_profs)
+        self._day_starts = u32('day_starts', self.n_profs * len(DAYS_OF_WEEK) + 1)
+        present_start = header['day_present']
+        self._day_present = view[present_start:present_start + self.n_profs]
+        self._entries = u32('entries', header['n_entries'] * ENTRY_WIDTH)
+        self._course_rows = u32('course_rows', self.n_courses * COURSE_WIDTH)
+
+    def _bytes(self, string_id):
+        return self._str_blob[self._str_offsets[string_id]:self._str_offsets[string_id + 1]]
+
+    def _string(self, string_id):
+        return str(self._bytes(string_id), 'utf-8')
+
+    def _find_professor(self, prof_name):
+        """Binary search for a professor's index, or -1"""
+        target = prof_name.encode('utf-8')
+        lo, hi = 0, self.n_profs
+        while lo < hi:
+            mid = (lo + hi) // 2
+            prof = self._prof_sorted[mid]
+            if bytes(self._bytes(self._prof_names[prof])) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_profs:
+            prof = self._prof_sorted[lo]
+            if bytes(self._bytes(self._prof_names[prof])) == target:
+                return prof
+        return -1
+
+    def _entry(self, index):
+        base = index * ENTRY_WIDTH
+        return {column: self._string(self._entries[base + i]) for i, column in enumerate(ENTRY_COLUMNS)}
+
+    def _day_range(self, prof, day_index):
+        slot = prof * len(DAYS_OF_WEEK) + day_index
+        return self._day_starts[slot], self._day_starts[slot + 1]
+
+    def has_professor(self, prof_name):
+        """Check whether a professor exists"""
+        return self._find_professor(prof_name) >= 0
+
+    def get_day_schedule(self, prof_name, day):
+        """Get a professor's classes for one day, or None if the day is not in their schedule"""
+        prof = self._find_professor(prof_name)
+        if prof < 0 or day not in DAYS_OF_WEEK:
+            return None
+        day_index = DAYS_OF_WEEK.index(day)
+        if not self._day_present[prof] & (1 << day_index):
+            return None
+        start, end = self._day_range(prof, day_index)
+        return [self._entry(i) for i in range(start, end)]
+
+    def get_room_table(self):
+        """Room hierarchy written at ingestion; not stored here, so rooms.RoomIndex parses the codes"""
+        return None
+
+    def iter_classes(self):
+        """Yield (professor, day, class_info) for every scheduled class"""
+        for prof in range(self.n_profs):
+            prof_name = self._string(self._prof_names[prof])
+            for day_index, day in enumerate(DAYS_OF_WEEK):
+                start, end = self._day_range(prof, day_index)
+                for i in range(start, end):
+                    yield prof_name, day, self._entry(i)
+
+    def search_professors(self, query):
+        """Search professors by name; same results and order as DictStore.search_professors"""
+        if not query:
+            return [self._string(self._prof_names[i]) for i in range(min(10, self.n_profs))]
+
+        query = query.lower()
+        matches = []
+        for prof in range(self.n_profs):
+            prof_lower = self._string(self._prof_lower[prof])
+            # Prefix and word-prefix matches are substring matches too
+            if query == prof_lower:
+                matches.insert(0, prof)
+            elif query in prof_lower:
+                matches.append(prof)
+        return [self._string(self._prof_names[prof]) for prof in matches[:10]]
+
+    def search_courses(self, query, limit=10):
+        """Search courses by number or title, one result per course"""
+        query = query.lower()
+        results = []
+        seen = set()
+        for i in range(self.n_courses):
+            text_id = self._course_rows[i * COURSE_WIDTH + 2]
+            if text_id in seen or query not in self._string(text_id):
+                continue
+            seen.add(text_id)
+            course = json.loads(self._string(self._course_rows[i * COURSE_WIDTH + 3]))
+            results.append({'course_number': course['course_number'], 'course_title': course['course_title']})
+            if len(results) >= limit:
+                break
+        return results
+
+    def get_room_schedule(self, room, day):
+        """Get every class held in a room on one day"""
+        if day not in DAYS_OF_WEEK:
+            return []
+        room_bytes = room.encode('utf-8')
+        day_index = DAYS_OF_WEEK.index(day)
+        room_column = ENTRY_COLUMNS.index('room')
+        results = []
+        for prof in range(self.n_profs):
+            start, end = self._day_range(prof, day_index)
+            for i in range(start, end):
+                if self._bytes(self._entries[i * ENTRY_WIDTH + room_column]) == room_bytes:
+                    results.append(dict(self._entry(i), instructor=self._string(self._prof_names[prof])))
+        return results
+
+    def get_course_sections(self, code):
+        """Get all sections of a course by comp code or course number"""
+        code = code.strip().upper()
+        sections = []
+        for i in range(self.n_courses):
+            base = i * COURSE_WIDTH
+            if self._string(self._course_rows[base]) == code or self._string(self._course_rows[base + 1]) == code:
+                sections.append(json.loads(self._string(self._course_rows[base + 3])))
+        return sections
+
+def main():
+    """Build the shared index from structured_data.json"""
+    json_path = sys.argv[1] if len(sys.argv) > 1 else 'structured_data.json'
+    index_path = sys.argv[2] if len(sys.argv) > 2 else 'structured_data.idx'
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    build_index(data, index_path)
+    print(f"✅ Built {index_path} ({os.path.getsize(index_path)} bytes) from {json_path}")
+
+if __name__ == "__main__":
+    main()
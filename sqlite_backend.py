@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+SQLite storage backend for the Professor Locator
+Loads processor output into an indexed SQLite database (sections, professors,
+meetings and rooms, plus an FTS5 trigram table over professor names and course
+titles) and answers the same queries as schedule_store.DictStore. The database
+is opened read-only and memory-mapped, so many workers can share one file.
+
+Usage:
+    python sqlite_backend.py [structured_data.json] [structured_data.db]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+SCHEMA = """
+CREATE TABLE professors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    name_lower TEXT NOT NULL
+);
+CREATE TABLE professor_days (
+    professor_id INTEGER NOT NULL REFERENCES professors(id),
+    day TEXT NOT NULL,
+    PRIMARY KEY (professor_id, day)
+) WITHOUT ROWID;
+CREATE TABLE rooms (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE sections (
+    id INTEGER PRIMARY KEY,
+    course_key TEXT NOT NULL UNIQUE,
+    course_code TEXT NOT NULL,
+    course_number TEXT NOT NULL,
+    course_number_key TEXT NOT NULL,
+    course_title TEXT NOT NULL,
+    section TEXT NOT NULL,
+    room TEXT NOT NULL,
+    days TEXT NOT NULL,
+    time_slots TEXT NOT NULL,
+    instructors TEXT NOT NULL
+);
+CREATE TABLE meetings (
+    id INTEGER PRIMARY KEY,
+    professor_id INTEGER NOT NULL REFERENCES professors(id),
+    day TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    time TEXT NOT NULL,
+    course_code TEXT NOT NULL,
+    course_title TEXT NOT NULL,
+    section TEXT NOT NULL,
+    room_id INTEGER NOT NULL REFERENCES rooms(id)
+);
+CREATE VIRTUAL TABLE search_fts USING fts5(text, kind UNINDEXED, ref UNINDEXED, tokenize='trigram');
+
+CREATE INDEX idx_meetings_professor_day ON meetings (professor_id, day, position);
+CREATE INDEX idx_meetings_room_day ON meetings (room_id, day);
+CREATE INDEX idx_sections_course_code ON sections (course_code);
+CREATE INDEX idx_sections_course_number ON sections (course_number_key);
+"""
+
+# The trigram tokenizer cannot match queries shorter than three characters
+MIN_FTS_QUERY = 3
+
+MEETING_COLUMNS = ('time', 'course_code', 'course_title', 'section', 'room')
+
+def build_database(data, db_path):
+    """Write processor output to a fresh SQLite database at db_path"""
+    tmp_path = db_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        room_ids = {}
+
+        def room_id(room):
+            if room not in room_ids:
+                room_ids[room] = conn.execute("INSERT INTO rooms (name) VALUES (?)", (room,)).lastrowid
+            return room_ids[room]
+
+        for prof_name, prof_data in data.get('professors', {}).items():
+            prof_id = conn.execute("INSERT INTO professors (name, name_lower) VALUES (?, ?)",
+                                   (prof_name, prof_name.lower())).lastrowid
+            conn.execute("INSERT INTO search_fts (text, kind, ref) VALUES (?, 'professor', ?)", (prof_name, prof_id))
+
+            for day, entries in prof_data.get('schedule', {}).items():
+                conn.execute("INSERT INTO professor_days (professor_id, day) VALUES (?, ?)", (prof_id, day))
+                conn.executemany(
+                    "INSERT INTO meetings (professor_id, day, position, time, course_code, course_title, section, room_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(prof_id, day, position, e['time'], e['course_code'], e['course_title'], e['section'], room_id(e['room']))
+                     for position, e in enumerate(entries)]
+                )
+
+        seen_courses = set()
+        for course_key, course in data.get('courses', {}).items():
+            section_id = conn.execute(
+                "INSERT INTO sections (course_key, course_code, course_number, course_number_key, course_title, "
+                "section, room, days, time_slots, instructors) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (course_key, course['course_code'], course['course_number'], course['course_number'].upper(),
+                 course['course_title'], course['section'], course['room'], json.dumps(course['days']),
+                 json.dumps(course['time_slots']), json.dumps(course['instructors']))
+            ).lastrowid
+
+            course_id = (course['course_number'], course['course_title'])
+            if course_id not in seen_courses:
+                seen_courses.add(course_id)
+                conn.execute("INSERT INTO search_fts (text, kind, ref) VALUES (?, 'course', ?)",
+                             (f"{course['course_number']} {course['course_title']}", section_id))
+
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+
+class SQLiteStore:
+    """Answer schedule queries from a read-only SQLite database"""
+
+    def __init__(self, db_path, mmap_size=256 * 1024 * 1024):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(db_path)
+        self.db_path = os.path.abspath(db_path)
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+
+    def _conn(self):
+        # sqlite3 connections are per thread; each keeps its own prepared statement cache
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, cached_statements=64)
+            conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+            conn.execute("PRAGMA query_only = ON")
+            self._local.conn = conn
+        return conn
+
+    def has_professor(self, prof_name):
+        """Check whether a professor exists"""
+        return self._conn().execute("SELECT 1 FROM professors WHERE name = ?", (prof_name,)).fetchone() is not None
+
+    def get_day_schedule(self, prof_name, day):
+        """Get a professor's classes for one day, or None if the day is not in their schedule"""
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT pd.professor_id FROM professors p JOIN professor_days pd ON pd.professor_id = p.id "
+            "WHERE p.name = ? AND pd.day = ?", (prof_name, day)).fetchone()
+        if row is None:
+            return None
+
+        rows = conn.execute(
+            "SELECT m.time, m.course_code, m.course_title, m.section, r.name FROM meetings m "
+            "JOIN rooms r ON r.id = m.room_id WHERE m.professor_id = ? AND m.day = ? ORDER BY m.position",
+            (row[0], day)).fetchall()
+        return [dict(zip(MEETING_COLUMNS, r)) for r in rows]
+
+    def get_room_table(self):
+        """Room hierarchy written at ingestion; not stored here, so rooms.RoomIndex parses the codes"""
+        return None
+
+    def iter_classes(self):
+        """Yield (professor, day, class_info) for every scheduled class"""
+        rows = self._conn().execute(
+            "SELECT p.name, m.day, m.time, m.course_code, m.course_title, m.section, r.name FROM meetings m "
+            "JOIN professors p ON p.id = m.professor_id JOIN rooms r ON r.id = m.room_id "
+            "ORDER BY m.professor_id, m.id")
+        for row in rows:
+            yield row[0], row[1], dict(zip(MEETING_COLUMNS, row[2:]))
+
+    def search_professors(self, query):
+        """Search professors by name; same results and order as DictStore.search_professors"""
+        conn = self._conn()
+        if not query:
+            return [r[0] for r in conn.execute("SELECT name FROM professors ORDER BY id LIMIT 10")]
+
+        query = query.lower()
+        # Every fuzzy rule (prefix, word prefix) implies a substring match. Exact matches
+        # go first, the last one found first, then the rest in insertion order.
+        order = "ORDER BY CASE WHEN p.name_lower = :q THEN -p.id ELSE p.id END LIMIT 10"
+        if len(query) >= MIN_FTS_QUERY:
+            sql = ("SELECT p.name FROM search_fts f JOIN professors p ON p.id = f.ref "
+                   "WHERE search_fts MATCH :match AND f.kind = 'professor' " + order)
+            params = {'q': query, 'match': _fts_phrase(query)}
+        else:
+            sql = "SELECT p.name FROM professors p WHERE instr(p.name_lower, :q) > 0 " + order
+            params = {'q': query}
+        return [r[0] for r in conn.execute(sql, params)]
+
+    def search_courses(self, query, limit=10):
+        """Search courses by number or title, one result per course"""
+        conn = self._conn()
+        query = query.lower()
+        if len(query) >= MIN_FTS_QUERY:
+            rows = conn.execute(
+                "SELECT s.course_number, s.course_title FROM search_fts f JOIN sections s ON s.id = f.ref "
+                "WHERE search_fts MATCH ? AND f.kind = 'course' ORDER BY s.id LIMIT ?",
+                (_fts_phrase(query), limit))
+        else:
+            rows = conn.execute(
+                "SELECT s.course_number, s.course_title FROM search_fts f JOIN sections s ON s.id = f.ref "
+                "WHERE f.kind = 'course' AND instr(lower(f.text), ?) > 0 ORDER BY s.id LIMIT ?", (query, limit))
+        return [{'course_number': r[0], 'course_title': r[1]} for r in rows]
+
+    def get_room_schedule(self, room, day):
+        """Get every class held in a room on one day"""
+        rows = self._conn().execute(
+            "SELECT m.time, m.course_code, m.course_title, m.section, r.name, p.name FROM rooms r "
+            "JOIN meetings m ON m.room_id = r.id JOIN professors p ON p.id = m.professor_id "
+            "WHERE r.name = ? AND m.day = ? ORDER BY m.professor_id, m.position", (room, day)).fetchall()
+        return [dict(zip(MEETING_COLUMNS + ('instructor',), r)) for r in rows]
+
+    def get_course_sections(self, code):
+        """Get all sections of a course by comp code or course number"""
+        code = code.strip().upper()
+        rows = self._conn().execute(
+            "SELECT course_code, course_number, course_title, section, room, days, time_slots, instructors "
+            "FROM sections WHERE course_code = ? OR course_number_key = ? ORDER BY id", (code, code)).fetchall()
+        return [{
+            'course_code': r[0],
+            'course_number': r[1],
+            'course_title': r[2],
+            'section': r[3],
+            'room': r[4],
+            'days': json.loads(r[5]),
+            'time_slots': json.loads(r[6]),
+            'instructors': json.loads(r[7])
+        } for r in rows]
+
+def _fts_phrase(query):
+    """Quote a query as a single FTS5 phrase"""
+    return '"' + query.replace('"', '""') + '"'
+
+def main():
+    """Build the SQLite database from structured_data.json"""
+    json_path = sys.argv[1] if len(sys.argv) > 1 else 'structured_data.json'
+    db_path = sys.argv[2] if len(sys.argv) > 2 else 'structured_data.db'
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    build_database(data, db_path)
+    print(f"✅ Built {db_path} from {json_path}")
+    print(f"📊 {len(data.get('professors', {}))} professors, {len(data.get('courses', {}))} course sections")
+
+if __name__ == "__main__":
+    main()
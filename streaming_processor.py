@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Streaming Data Processor for BITS Pilani Timetable
+Reads very large timetable CSVs row by row with the csv module and writes
+professor, section and meeting records incrementally as JSON Lines, so peak
+memory does not grow with the size of the input file
+"""
+
+import argparse
+import csv
+import json
+
+from comprehensive_data_processor import clean_text, format_comp_code, parse_days, get_time_slots, save_data
+from entity_resolution import resolve_entities
+from rooms import add_room_table
+
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def read_rows(csv_file_path):
+    """Yield CSV rows as dicts, skipping the title line above the header"""
+    with open(csv_file_path, 'r', encoding='utf-8', newline='') as f:
+        next(f, None)
+        for row in csv.DictReader(f):
+            yield row
+
+def iter_class_records(rows):
+    """Yield one class entry per row, carrying course info across continuation rows"""
+    current_course_data = None
+
+    for row in rows:
+        comp_code = format_comp_code(row.get('COMP CODE', ''))
+        course_no = clean_text(row.get('COURSE NO.', ''))
+        course_title = clean_text(row.get('COURSE TITLE', ''))
+        section = clean_text(row.get('SEC', ''))
+        instructor = clean_text(row.get('INSTRUCTOR_IN_CHARGE/INSTR UCTOR', ''))
+        room = clean_text(row.get('ROOM', ''))
+        days_str = clean_text(row.get('DAYS', ''))
+        hours = clean_text(row.get('HOUR S', ''))
+
+        # A row with all three course fields starts a new course
+        if comp_code and course_no and course_title:
+            current_course_data = {
+                'comp_code': comp_code,
+                'course_no': course_no,
+                'course_title': course_title
+            }
+
+        if not (section and instructor and current_course_data):
+            continue
+
+        days = parse_days(days_str)
+        time_slots = get_time_slots(hours)
+        if not days and not time_slots:
+            continue
+
+        yield {
+            'course_code': current_course_data['comp_code'],
+            'course_number': current_course_data['course_no'],
+            'course_title': current_course_data['course_title'],
+            'section': section,
+            'room': room,
+            'instructor': instructor,
+            'days': days,
+            'time_slots': time_slots,
+            'raw_hours': hours
+        }
+
+def iter_output_records(class_records):
+    """Turn class entries into professor, section and meeting records"""
+    seen_professors = set()
+
+    for class_info in class_records:
+        instructor = class_info['instructor']
+        if instructor not in seen_professors:
+            seen_professors.add(instructor)
+            yield {'type': 'professor', 'name': instructor}
+
+        yield {'type': 'section', 'key': f"{class_info['course_code']}_{class_info['section']}", **class_info}
+
+        for day in class_info['days']:
+            for time_slot in class_info['time_slots'] or [""]:
+                yield {
+                    'type': 'meeting',
+                    'instructor': instructor,
+                    'day': day,
+                    'time': time_slot,
+                    'course_code': class_info['course_code'],
+                    'course_title': class_info['course_title'],
+                    'section': class_info['section'],
+                    'room': class_info['room']
+                }
+
+def write_jsonl(records, output_file):
+    """Write records one per line as they arrive; returns the number written"""
+    count = 0
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    return count
+
+def read_jsonl(records_file):
+    """Yield records back from a JSON Lines snapshot"""
+    with open(records_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def fold_records(records):
+    """Build the structured_data.json layout from a record stream
+
+    Memory here is proportional to the output dataset, not to the CSV input.
+    """
+    professors = {}
+    courses = {}
+
+    for record in records:
+        record_type = record.get('type')
+
+        if record_type == 'professor':
+            professors.setdefault(record['name'], {
+                'name': record['name'],
+                'current_classes': [],
+                'schedule': {day: [] for day in DAYS_OF_WEEK}
+            })
+
+        elif record_type == 'section':
+            class_info = {k: v for k, v in record.items() if k not in ('type', 'key')}
+            courses[record['key']] = {
+                'course_code': class_info['course_code'],
+                'course_number': class_info['course_number'],
+                'course_title': class_info['course_title'],
+                'section': class_info['section'],
+                'room': class_info['room'],
+                'days': class_info['days'],
+                'time_slots': class_info['time_slots'],
+                'instructors': [class_info['instructor']]
+            }
+            professors[class_info['instructor']]['current_classes'].append(class_info)
+
+        elif record_type == 'meeting':
+            schedule = professors[record['instructor']]['schedule']
+            if record['day'] in schedule:
+                schedule[record['day']].append({
+                    'time': record['time'],
+                    'course_code': record['course_code'],
+                    'course_title': record['course_title'],
+                    'section': record['section'],
+                    'room': record['room']
+                })
+
+    return {'professors': professors, 'courses': courses}
+
+def main():
+    """Main processing function"""
+    parser = argparse.ArgumentParser(description="Stream a timetable CSV into JSON Lines records")
+    parser.add_argument('csv_file', help="Timetable CSV file")
+    parser.add_argument('-o', '--output', default='structured_data.jsonl', help="JSON Lines output file")
+    parser.add_argument('--structured', metavar='JSON_FILE',
+                        help="Also fold the records into a structured_data.json style file")
+    args = parser.parse_args()
+
+    pipeline = iter_output_records(iter_class_records(read_rows(args.csv_file)))
+    count = write_jsonl(pipeline, args.output)
+    print(f"✅ Streamed {count} records to {args.output}")
+
+    if args.structured:
+        save_data(add_room_table(resolve_entities(fold_records(read_jsonl(args.output)))), args.structured)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Regression tests for merging a saved alias table with a fresh resolution
+"""
+
+import json
+import os
+import tempfile
+
+from entity_resolution import merge_alias_tables, resolve_entities
+
+def _professor(name, n_classes):
+    classes = [{'course_code': f'C{i}', 'section': 'L1', 'time': '9:00', 'room': 'F201',
+                'instructor': name} for i in range(n_classes)]
+    return {'current_classes': classes, 'schedule': {'Monday': classes}}
+
+def test_canonical_flip_keeps_saved_canonical():
+    """A saved canonical name stays canonical when its variant gains more classes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        alias_path = os.path.join(tmp, 'aliases.json')
+        with open(alias_path, 'w', encoding='utf-8') as f:
+            json.dump({'aliases': {'VIVEK SHARMA': 'Vivek Sharma'}}, f)
+
+        data = {'professors': {'VIVEK SHARMA': _professor('VIVEK SHARMA', 3),
+                               'Vivek Sharma': _professor('Vivek Sharma', 1)},
+                'courses': {}}
+        resolve_entities(data, alias_path)
+
+        assert list(data['professors']) == ['Vivek Sharma']
+        assert len(data['professors']['Vivek Sharma']['current_classes']) == 3
+        with open(alias_path, 'r', encoding='utf-8') as f:
+            assert json.load(f)['aliases'] == {'VIVEK SHARMA': 'Vivek Sharma'}
+
+def test_conflicting_saved_aliases_are_replaced():
+    """Saved entries reversed by the new resolution never produce a self-alias"""
+    assert merge_alias_tables({'A': 'B'}, {'B': 'A'}) == {'B': 'A'}
+    assert merge_alias_tables({'C': 'B'}, {'B': 'A'}) == {'B': 'A', 'C': 'A'}
+    assert merge_alias_tables({'A': 'B', 'B': 'A'}, {}) == {}
+
+if __name__ == "__main__":
+    test_canonical_flip_keeps_saved_canonical()
+    test_conflicting_saved_aliases_are_replaced()
+    print("✅ Entity resolution tests passed")
@@ -0,0 +1,88 @@
+"""
+Time slot helpers shared by the processors and the apps
+Timetable times are written on a 12-hour clock without AM/PM ("1:00-1:50" is
+the hour after noon), so clock hours before 8 are read as afternoon hours.
+"""
+
+import re
+
+# First teaching hour of the day; earlier clock hours belong to the afternoon
+FIRST_HOUR = 8
+
+def parse_clock(text):
+    """Convert an "H:MM" timetable clock time to minutes since midnight"""
+    hour, minute = map(int, text.strip().split(':'))
+    if hour < FIRST_HOUR:
+        hour += 12
+    return hour * 60 + minute
+
+def parse_time_range(time_slot):
+    """Convert an "H:MM-H:MM" slot to (start, end) minutes since midnight, or None"""
+    if not time_slot or '-' not in time_slot:
+        return None
+    try:
+        start, end = time_slot.split('-')
+        return parse_clock(start), parse_clock(end)
+    except ValueError:
+        return None
+
+# Timetable hours are numbered 1 (8:00) to 12 (19:00)
+LAST_HOUR_CODE = 12
+
+DATE_PATTERN = re.compile(r'^(\d{1,2})/(\d{1,2})/(?:20)?(\d{1,2})$')
+
+def _split_run(token):
+    """Split a digit run like "910" or "1112" into consecutive hour numbers, or None
+
+    Splits into several consecutive hours win over reading the run as one
+    number, so "12" is hours 1 and 2 like "23" and "34" are.
+    """
+    def split_from(position, previous):
+        if position == len(token):
+            return []
+        expected = str(previous + 1)
+        if previous + 1 > LAST_HOUR_CODE or not token.startswith(expected, position):
+            return None
+        rest = split_from(position + len(expected), previous + 1)
+        return None if rest is None else [previous + 1] + rest
+
+    candidates = []
+    for width in (1, 2):
+        first = token[:width]
+        if len(first) == width and not first.startswith('0') and 1 <= int(first) <= LAST_HOUR_CODE:
+            rest = split_from(width, int(first))
+            if rest is not None:
+                candidates.append([int(first)] + rest)
+    return max(candidates, key=len) if candidates else None
+
+def format_hour_interval(first, last):
+    """Clock range covering timetable hours first to last; (6, 8) gives 1:00-3:50"""
+    start = (FIRST_HOUR + first - 2) % 12 + 1
+    end = (FIRST_HOUR + last - 2) % 12 + 1
+    return f"{start}:00-{end}:50"
+
+def parse_hour_code(code):
+    """Convert an hour code to merged "H:MM-H:MM" intervals, one per contiguous session
+
+    Handles single hours ("7"), combined runs ("89", "910", "1112"), spaced
+    lists ("6 7 8") and runs a spreadsheet turned into dates ("08/09/2010").
+    Returns [] when the code cannot be read.
+    """
+    code = str(code or '').strip()
+    date = DATE_PATTERN.match(code)
+    tokens = [str(int(part)) for part in date.groups()] if date else code.split()
+
+    hours = set()
+    for token in tokens:
+        run = _split_run(token) if token.isdigit() else None
+        if run is None:
+            return []
+        hours.update(run)
+
+    intervals = []
+    for hour in sorted(hours):
+        if intervals and intervals[-1][1] == hour - 1:
+            intervals[-1][1] = hour
+        else:
+            intervals.append([hour, hour])
+    return [format_hour_interval(first, last) for first, last in intervals]